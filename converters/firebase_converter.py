@@ -39,13 +39,13 @@ def update_build_gradle(output_dir: str, package_name: str) -> None:
     """
     app_build_gradle_path = os.path.join(output_dir, 'app/build.gradle.kts')
 
-    if not os.path.exists(app_build_gradle_path):
+    # build.gradle.kts の内容を読み込み（事前に存在確認をせず、読み込みに失敗した場合に警告する）
+    try:
+        content = read_file(app_build_gradle_path)
+    except FileNotFoundError:
         print(f"警告: build.gradle.kts が見つかりません: {app_build_gradle_path}")
         return
 
-    # build.gradle.kts の内容を読み込み
-    content = read_file(app_build_gradle_path)
-
     # Firebase の依存関係を追加
     firebase_dependencies = """
     // Firebase
@@ -6,10 +6,17 @@ Gradle 設定を行うモジュール
 """
 
 import os
+import re
 from typing import Dict, List, Any
 
 from utils.file_utils import read_file, write_file
 
+# テンプレートの SQLDelight のデータベース名（create("XxxDatabase")）
+_DATABASE_NAME_RE = re.compile(r'create\("([^"]+)Database"\)')
+
+# テンプレートの settings.gradle.kts のプロジェクト名
+_ROOT_PROJECT_NAME_RE = re.compile(r'rootProject\.name\s*=\s*"[^"]*"')
+
 def setup_gradle(output_dir: str, project_info: Dict[str, Any], package_name: str, app_name: str) -> None:
     """
     Gradle 設定を行います。
@@ -122,9 +129,9 @@ def update_app_build_gradle(output_dir: str, project_info: Dict[str, Any], packa
         # SQLDelightのデータベース名を置換（存在する場合）
         if "create(\"" in app_build_gradle_content and "Database\")" in app_build_gradle_content:
             # 既存のデータベース名を抽出
-            import re
-            db_name_match = re.search(r'create\("([^"]+)Database"\)', app_build_gradle_content)
-            if db_name_match:
+            db_name_match = _DATABASE_NAME_RE.search(app_build_gradle_content)
+            # 既に同じ名前の場合は置換しても内容が変わらないため、走査を省略
+            if db_name_match and db_name_match.group(1) != app_name:
                 existing_db_name = db_name_match.group(1)
                 app_build_gradle_content = app_build_gradle_content.replace(
                     f'create("{existing_db_name}Database")',
@@ -281,9 +288,7 @@ def update_settings_gradle(output_dir: str, app_name: str) -> None:
         settings_gradle_content = read_file(template_settings_gradle_path)
 
         # プロジェクト名を置換
-        import re
-        settings_gradle_content = re.sub(
-            r'rootProject\.name\s*=\s*"[^"]*"',
+        settings_gradle_content = _ROOT_PROJECT_NAME_RE.sub(
             f'rootProject.name = "{app_name.lower()}"',
             settings_gradle_content
         )
@@ -5,13 +5,51 @@
 Swift のモデルを Kotlin のモデルに変換するモジュール
 """
 
+import logging
 import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 
-from utils.file_utils import read_file, write_file, get_filename
+from utils.file_utils import ensure_directory, read_file, write_file, get_filename
+from utils.incremental import convert_changed_files
 from utils.parser import parse_swift_file, swift_type_to_kotlin
 
+logger = logging.getLogger(__name__)
+
+# SwiftData を使用している場合のインポート（行のリストに一つの要素として追加する）
+_SWIFTDATA_IMPORTS = """\
+import app.cash.sqldelight.ColumnAdapter
+import kotlinx.serialization.json.Json"""
+
+# SQLDelight 用のアダプター（str.format 用、Kotlin の波括弧は二重にしてエスケープ）
+_ADAPTER_TEMPLATE = """
+object {class_name}Adapter {{
+    val adapter = object : ColumnAdapter<{class_name}, String> {{
+        private val json = Json {{ ignoreUnknownKeys = true }}
+
+        override fun decode(databaseValue: String): {class_name} {{
+            return json.decodeFromString<{class_name}>(databaseValue)
+        }}
+
+        override fun encode(value: {class_name}): String {{
+            return json.encodeToString({class_name}.serializer(), value)
+        }}
+    }}
+}}"""
+
+# Swift のデフォルト値から Kotlin のデフォルト値（代入部分）への対応
+_KOTLIN_DEFAULT_VALUES = {
+    '[]': ' = emptyList()',
+    '{}': ' = emptyMap()',
+    '""': ' = ""',
+    '0': ' = 0',
+    'false': ' = false',
+    'true': ' = true',
+}
+
+# 列挙型のケース（case name または case name = value）
+_ENUM_CASE_RE = re.compile(r'case\s+(\w+)(?:\s*=\s*(.+))?')
+
 def convert_models(from_dir: str, package_dir: str, project_info: Dict[str, Any], package_name: str) -> None:
     """
     Swift のモデルを Kotlin のモデルに変換します。
@@ -22,46 +60,50 @@ def convert_models(from_dir: str, package_dir: str, project_info: Dict[str, Any]
         project_info: プロジェクト情報
         package_name: Android アプリのパッケージ名
     """
-    print("モデルを変換しています...")
+    logger.info("モデルを変換しています...")
 
     models_dir = os.path.join(package_dir, 'models')
-    os.makedirs(models_dir, exist_ok=True)
-
-    for model_path in project_info['models']:
-        full_path = os.path.join(from_dir, model_path)
-        if not os.path.exists(full_path):
-            print(f"警告: モデルファイルが見つかりません: {full_path}")
-            continue
-
-        print(f"モデルを変換しています: {model_path}")
+    ensure_directory(models_dir)
 
-        # Swift ファイルを解析
-        swift_content = read_file(full_path)
-        model_info = parse_swift_file(swift_content)
-
-        # Kotlin モデルを生成
-        kotlin_content = generate_kotlin_model(model_info, package_name)
-
-        # ファイル名を決定
+    def plan(model_path: str) -> Tuple[str, str]:
+        # ファイル名を決定（User.swift と UserModel.swift は同じ出力先になる）
         filename = get_filename(model_path)
         if filename.endswith('Model'):
             kotlin_filename = f"{filename}.kt"
         else:
             kotlin_filename = f"{filename}Model.kt"
+        return os.path.join(models_dir, kotlin_filename), package_name
+
+    # 前回の変換から変更されたファイルだけを並列に変換
+    convert_changed_files("モデル", from_dir, project_info['models'], plan, _convert_one_model, project_info, package_name)
+
+def _convert_one_model(full_path: str, kotlin_path: str, package_name: str) -> None:
+    """
+    1 つのモデルファイルを変換して書き込みます。ワーカープロセスで実行されます。
+
+    Args:
+        full_path: Swift ファイルのパス
+        kotlin_path: 出力先のパス
+        package_name: Android アプリのパッケージ名
+    """
+    # Swift ファイルを解析
+    swift_content = read_file(full_path)
+    model_info = parse_swift_file(swift_content)
 
-        # Kotlin ファイルを書き込み
-        kotlin_path = os.path.join(models_dir, kotlin_filename)
-        write_file(kotlin_path, kotlin_content)
+    # Kotlin モデルを生成
+    kotlin_content = generate_kotlin_model(model_info, package_name, swift_content)
 
-        print(f"モデルを変換しました: {kotlin_path}")
+    # Kotlin ファイルを書き込み
+    write_file(kotlin_path, kotlin_content)
 
-def generate_kotlin_model(model_info: Dict[str, Any], package_name: str) -> str:
+def generate_kotlin_model(model_info: Dict[str, Any], package_name: str, swift_content: str = "") -> str:
     """
     Swift のモデル情報から Kotlin のモデルを生成します。
 
     Args:
         model_info: Swift モデルの情報
         package_name: Android アプリのパッケージ名
+        swift_content: Swift ファイルの内容（列挙型のケースの抽出に使用）
 
     Returns:
         生成された Kotlin モデルのコード
@@ -77,10 +119,7 @@ def generate_kotlin_model(model_info: Dict[str, Any], package_name: str) -> str:
 
     # SwiftData を使用している場合は SQLDelight 用のインポートを追加
     if model_info['uses_swiftdata']:
-        lines.extend([
-            "import app.cash.sqldelight.ColumnAdapter",
-            "import kotlinx.serialization.json.Json"
-        ])
+        lines.append(_SWIFTDATA_IMPORTS)
 
     lines.append("")
 
@@ -106,21 +145,8 @@ def generate_kotlin_model(model_info: Dict[str, Any], package_name: str) -> str:
                 default_value = type_parts[1].strip()
                 kotlin_type = swift_type_to_kotlin(swift_type)
 
-                # Swift のデフォルト値を Kotlin のデフォルト値に変換
-                if default_value == "[]":
-                    default_value = " = emptyList()"
-                elif default_value == "{}":
-                    default_value = " = emptyMap()"
-                elif default_value == "\"\"":
-                    default_value = " = \"\""
-                elif default_value == "0":
-                    default_value = " = 0"
-                elif default_value == "false":
-                    default_value = " = false"
-                elif default_value == "true":
-                    default_value = " = true"
-                else:
-                    default_value = ""
+                # Swift のデフォルト値を Kotlin のデフォルト値に変換（対応しない値は省略）
+                default_value = _KOTLIN_DEFAULT_VALUES.get(default_value, "")
 
             # プロパティ行を追加
             comma = "," if i < len(model_info['properties']) - 1 else ""
@@ -134,8 +160,7 @@ def generate_kotlin_model(model_info: Dict[str, Any], package_name: str) -> str:
         lines.append(f"enum class {class_name} {{")
 
         # 列挙型の値を抽出
-        enum_pattern = r'case\s+(\w+)(?:\s*=\s*(.+))?'
-        enum_matches = re.findall(enum_pattern, swift_content)
+        enum_matches = _ENUM_CASE_RE.findall(swift_content)
 
         for i, enum_match in enumerate(enum_matches):
             name = enum_match[0]
@@ -151,21 +176,6 @@ def generate_kotlin_model(model_info: Dict[str, Any], package_name: str) -> str:
 
     # SQLDelight 用のアダプターを追加（SwiftData を使用している場合）
     if model_info['uses_swiftdata']:
-        lines.extend([
-            "",
-            f"object {class_name}Adapter {{",
-            f"    val adapter = object : ColumnAdapter<{class_name}, String> {{",
-            f"        private val json = Json {{ ignoreUnknownKeys = true }}",
-            "",
-            f"        override fun decode(databaseValue: String): {class_name} {{",
-            f"            return json.decodeFromString<{class_name}>(databaseValue)",
-            f"        }}",
-            "",
-            f"        override fun encode(value: {class_name}): String {{",
-            f"            return json.encodeToString({class_name}.serializer(), value)",
-            f"        }}",
-            f"    }}",
-            f"}}"
-        ])
+        lines.append(_ADAPTER_TEMPLATE.format(class_name=class_name))
 
     return "\n".join(lines)
\ No newline at end of file
@@ -5,12 +5,18 @@
 Swift のリポジトリを Kotlin のリポジトリに変換するモジュール
 """
 
+import logging
 import os
 import re
-from typing import Dict, List, Any
+from string import Template
+from typing import Dict, List, Any, Tuple
 
-from utils.file_utils import read_file, write_file, get_filename
-from utils.parser import parse_swift_file, swift_type_to_kotlin, swift_method_to_kotlin
+from utils.file_utils import ensure_directory, write_file, get_filename
+from utils.incremental import convert_changed_files
+from utils.parallel import project_flags
+from utils.parser import parse_swift_file_cached, swift_type_to_kotlin
+
+logger = logging.getLogger(__name__)
 
 def convert_repositories(from_dir: str, package_dir: str, project_info: Dict[str, Any], package_name: str) -> None:
     """
@@ -22,183 +28,235 @@ def convert_repositories(from_dir: str, package_dir: str, project_info: Dict[str
         project_info: プロジェクト情報
         package_name: Android アプリのパッケージ名
     """
-    print("リポジトリを変換しています...")
+    logger.info("リポジトリを変換しています...")
 
     repositories_dir = os.path.join(package_dir, 'repositories')
-    os.makedirs(repositories_dir, exist_ok=True)
+    ensure_directory(repositories_dir)
 
-    for repo_path in project_info['repositories']:
-        full_path = os.path.join(from_dir, repo_path)
-        if not os.path.exists(full_path):
-            print(f"警告: リポジトリファイルが見つかりません: {full_path}")
-            continue
+    # ワーカーにはプロジェクト情報全体ではなく、生成で参照するフラグだけを渡す
+    flags = project_flags(project_info)
 
-        print(f"リポジトリを変換しています: {repo_path}")
+    def plan(repo_path: str) -> Tuple[str, Tuple[str, Dict[str, bool]]]:
+        # 出力先のパスと、変換に渡す引数を決定
+        filename = get_filename(repo_path)
+        kotlin_path = os.path.join(repositories_dir, f"{filename}.kt")
+        return kotlin_path, (package_name, flags)
 
-        # Swift ファイルを解析
-        swift_content = read_file(full_path)
-        repo_info = parse_swift_file(swift_content)
+    # 前回の変換から変更されたファイルだけを並列に変換
+    convert_changed_files("リポジトリ", from_dir, project_info['repositories'], plan, _convert_one_repository, project_info, package_name)
 
-        # Kotlin リポジトリを生成
-        kotlin_content = generate_kotlin_repository(repo_info, package_name, project_info)
+def _convert_one_repository(full_path: str, kotlin_path: str, args: Tuple[str, Dict[str, bool]]) -> None:
+    """
+    1 つのリポジトリファイルを変換して書き込みます。ワーカープロセスで実行されます。
 
-        # ファイル名を決定
-        filename = get_filename(repo_path)
-        kotlin_filename = f"{filename}.kt"
+    Args:
+        full_path: Swift ファイルのパス
+        kotlin_path: 出力先のパス
+        args: (パッケージ名, プロジェクトのフラグ) のタプル
+    """
+    package_name, flags = args
+
+    # Swift ファイルを解析（同じファイルの再解析はキャッシュで省略）
+    repo_info = parse_swift_file_cached(full_path)
 
-        # Kotlin ファイルを書き込み
-        kotlin_path = os.path.join(repositories_dir, kotlin_filename)
-        write_file(kotlin_path, kotlin_content)
+    # Kotlin リポジトリを生成
+    kotlin_content = generate_kotlin_repository(repo_info, package_name, flags)
 
-        print(f"リポジトリを変換しました: {kotlin_path}")
+    # Kotlin ファイルを書き込み
+    write_file(kotlin_path, kotlin_content)
 
-def generate_kotlin_repository(repo_info: Dict[str, Any], package_name: str, project_info: Dict[str, Any]) -> str:
+def generate_kotlin_repository(repo_info: Dict[str, Any], package_name: str, project_info: Dict[str, Any]) -> bytes:
     """
     Swift のリポジトリ情報から Kotlin のリポジトリを生成します。
 
     Args:
         repo_info: Swift リポジトリの情報
         package_name: Android アプリのパッケージ名
-        project_info: プロジェクト情報
+        project_info: プロジェクト情報（uses_swiftdata と uses_firebase のフラグだけを参照）
 
     Returns:
-        生成された Kotlin リポジトリのコード
+        生成された Kotlin リポジトリのコード（UTF-8 のバイト列）
     """
     class_name = repo_info['class_name']
 
-    # パッケージとインポート
-    lines = [
-        f"package {package_name}.repositories",
-        "",
-        "import kotlinx.coroutines.Dispatchers",
-        "import kotlinx.coroutines.flow.Flow",
-        "import kotlinx.coroutines.flow.flow",
-        "import kotlinx.coroutines.flow.flowOn",
-        "import kotlinx.coroutines.withContext",
-        f"import {package_name}.models.*",
-        f"import {package_name}.data.local.*",
-        f"import {package_name}.data.remote.*"
-    ]
-
-    # SwiftData を使用している場合
-    if repo_info['uses_swiftdata'] or project_info['uses_swiftdata']:
-        lines.append("import app.cash.sqldelight.coroutines.asFlow")
-        lines.append("import app.cash.sqldelight.coroutines.mapToList")
+    # 生成したコードは UTF-8 で直接バッファに書き込む
+    buf = bytearray()
 
-    # Firebase を使用している場合
-    if repo_info['uses_firebase'] or project_info['uses_firebase']:
-        lines.append("import com.google.firebase.auth.FirebaseAuth")
+    def w(line: str) -> None:
+        buf.extend(line.encode('utf-8'))
+        buf.append(0x0A)
 
-    lines.append("")
+    # パッケージとインポート
+    for line in _repository_header(
+        package_name,
+        repo_info['uses_swiftdata'] or project_info['uses_swiftdata'],
+        repo_info['uses_firebase'] or project_info['uses_firebase'],
+    ):
+        w(line)
 
     # インターフェース定義
     interface_name = class_name.replace("Repository", "")
-    lines.extend([
-        f"interface {interface_name}Repository {{",
-    ])
+    w(f"interface {interface_name}Repository {{")
 
-    # メソッドのインターフェース定義
-    for method in repo_info['methods']:
-        method_name = method['name']
-        parameters = method['parameters']
-        return_type = method['return_type']
-
-        # Swift のメソッドを Kotlin のメソッドに変換
-        kotlin_method_name, kotlin_parameters, kotlin_return_type = swift_method_to_kotlin(
-            method_name, parameters, return_type
-        )
-
-        # Flow を使用する場合
-        if kotlin_return_type and ('List' in kotlin_return_type or kotlin_return_type.endswith('?')):
+    # 解析時に Kotlin に変換済みのメソッドのシグネチャ
+    methods = repo_info['methods_soa']
+
+    # Flow を使用するかどうかと、戻り値の型をメソッドごとに一度だけ決める
+    signatures = []
+    for kotlin_method_name, kotlin_parameters, kotlin_return_type in zip(methods['names'], methods['params'], methods['rets']):
+        use_flow = bool(kotlin_return_type) and ('List' in kotlin_return_type or kotlin_return_type.endswith('?'))
+        if use_flow:
             kotlin_return_type = f"Flow<{kotlin_return_type}>"
+        signatures.append((kotlin_method_name, kotlin_parameters, kotlin_return_type, use_flow))
 
-        # メソッド定義
+    # メソッドのインターフェース定義
+    for kotlin_method_name, kotlin_parameters, kotlin_return_type, _ in signatures:
         if kotlin_parameters:
-            lines.append(f"    suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type}")
+            w(f"    suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type}")
         else:
-            lines.append(f"    suspend fun {kotlin_method_name}(): {kotlin_return_type}")
+            w(f"    suspend fun {kotlin_method_name}(): {kotlin_return_type}")
 
-    lines.append("}")
-    lines.append("")
+    w("}")
+    w("")
 
     # 実装クラス
-    lines.extend([
-        f"class {class_name}Impl(",
-        "    private val localDataSource: LocalDataSource,",
-        "    private val remoteDataSource: RemoteDataSource",
-        f") : {interface_name}Repository {{",
-    ])
+    w(_IMPL_HEADER.format(class_name=class_name, interface_name=interface_name))
 
-    # メソッドの実装
-    for method in repo_info['methods']:
-        method_name = method['name']
-        parameters = method['parameters']
-        return_type = method['return_type']
-
-        # Swift のメソッドを Kotlin のメソッドに変換
-        kotlin_method_name, kotlin_parameters, kotlin_return_type = swift_method_to_kotlin(
-            method_name, parameters, return_type
-        )
-
-        # Flow を使用する場合
-        use_flow = kotlin_return_type and ('List' in kotlin_return_type or kotlin_return_type.endswith('?'))
-        if use_flow:
-            original_return_type = kotlin_return_type
-            kotlin_return_type = f"Flow<{kotlin_return_type}>"
+    # メソッドの内容はインターフェース名だけで決まるため、ファイルごとに一度だけ作る
+    flow_body = _repository_method_body(True, interface_name)
+    with_context_body = _repository_method_body(False, interface_name)
 
-        # メソッド実装
+    # メソッドの実装
+    for kotlin_method_name, kotlin_parameters, kotlin_return_type, use_flow in signatures:
         if kotlin_parameters:
-            lines.append(f"    override suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type} {{")
+            w(f"    override suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type} {{")
         else:
-            lines.append(f"    override suspend fun {kotlin_method_name}(): {kotlin_return_type} {{")
+            w(f"    override suspend fun {kotlin_method_name}(): {kotlin_return_type} {{")
+
+        # メソッドの内容（閉じ括弧と空行まで）
+        w(flow_body if use_flow else with_context_body)
+
+    # 最後の行は改行なしで終える
+    buf.extend(b"}")
+
+    return bytes(buf)
+
+# 共通のインポート（行の区切りを含む文字列、末尾の改行なし）
+_BASE_IMPORTS = (
+    "import kotlinx.coroutines.Dispatchers\n"
+    "import kotlinx.coroutines.flow.Flow\n"
+    "import kotlinx.coroutines.flow.flow\n"
+    "import kotlinx.coroutines.flow.flowOn\n"
+    "import kotlinx.coroutines.withContext"
+)
+
+# SwiftData を使用している場合のインポート
+_SWIFTDATA_IMPORTS = [
+    "import app.cash.sqldelight.coroutines.asFlow",
+    "import app.cash.sqldelight.coroutines.mapToList",
+]
+
+# Firebase を使用している場合のインポート
+_FIREBASE_IMPORTS = [
+    "import com.google.firebase.auth.FirebaseAuth",
+]
+
+# 実装クラスの宣言（str.format 用、Kotlin の波括弧は二重にしてエスケープ）
+_IMPL_HEADER = """\
+class {class_name}Impl(
+    private val localDataSource: LocalDataSource,
+    private val remoteDataSource: RemoteDataSource
+) : {interface_name}Repository {{"""
+
+# Flow を返すメソッドの本体
+_FLOW_BODY = Template("""\
+        return flow {
+            try {
+                // ローカルデータソースからデータを取得
+                val localData = localDataSource.get${iface}()
+                emit(localData)
+
+                // リモートデータソースからデータを取得
+                val remoteData = remoteDataSource.fetch${iface}()
+
+                // ローカルデータソースを更新
+                localDataSource.save${iface}(remoteData)
+
+                // 更新されたデータを送信
+                emit(remoteData)
+            } catch (e: Exception) {
+                // エラー処理
+            }
+        }.flowOn(Dispatchers.IO)
+    }
+""")
+
+# withContext で値を返すメソッドの本体
+_WITH_CONTEXT_BODY = Template("""\
+        return withContext(Dispatchers.IO) {
+            try {
+                // TODO: 実装
+                // ローカルデータソースからデータを取得
+                val localData = localDataSource.get${iface}()
+                
+                // リモートデータソースからデータを取得
+                val remoteData = remoteDataSource.fetch${iface}()
+                
+                // ローカルデータソースを更新
+                localDataSource.save${iface}(remoteData)
+                
+                remoteData
+            } catch (e: Exception) {
+                // エラー処理
+                throw e
+            }
+        }
+    }
+""")
+
+def _repository_header(package_name: str, uses_swiftdata: bool, uses_firebase: bool) -> List[str]:
+    """
+    リポジトリファイルのパッケージ宣言とインポートを生成します。
 
-        # メソッドの内容
-        if use_flow:
-            lines.extend([
-                "        return flow {",
-                "            try {",
-                "                // ローカルデータソースからデータを取得",
-                f"                val localData = localDataSource.get{interface_name}()",
-                "                emit(localData)",
-                "",
-                "                // リモートデータソースからデータを取得",
-                f"                val remoteData = remoteDataSource.fetch{interface_name}()",
-                "",
-                "                // ローカルデータソースを更新",
-                f"                localDataSource.save{interface_name}(remoteData)",
-                "",
-                "                // 更新されたデータを送信",
-                "                emit(remoteData)",
-                "            } catch (e: Exception) {",
-                "                // エラー処理",
-                "            }",
-                "        }.flowOn(Dispatchers.IO)"
-            ])
-        else:
-            lines.extend([
-                "        return withContext(Dispatchers.IO) {",
-                "            try {",
-                "                // TODO: 実装",
-                f"                // ローカルデータソースからデータを取得",
-                f"                val localData = localDataSource.get{interface_name}()",
-                f"                ",
-                f"                // リモートデータソースからデータを取得",
-                f"                val remoteData = remoteDataSource.fetch{interface_name}()",
-                f"                ",
-                f"                // ローカルデータソースを更新",
-                f"                localDataSource.save{interface_name}(remoteData)",
-                f"                ",
-                f"                remoteData",
-                "            } catch (e: Exception) {",
-                "                // エラー処理",
-                "                throw e",
-                "            }",
-                "        }"
-            ])
-
-        lines.append("    }")
-        lines.append("")
-
-    lines.append("}")
-
-    return "\n".join(lines)
\ No newline at end of file
+    Args:
+        package_name: Android アプリのパッケージ名
+        uses_swiftdata: SwiftData を使用しているかどうか
+        uses_firebase: Firebase を使用しているかどうか
+
+    Returns:
+        ヘッダー部分の行のリスト（共通のインポートは複数行をまとめた 1 要素）
+    """
+    lines = [
+        f"package {package_name}.repositories",
+        "",
+        _BASE_IMPORTS,
+        f"import {package_name}.models.*",
+        f"import {package_name}.data.local.*",
+        f"import {package_name}.data.remote.*"
+    ]
+
+    if uses_swiftdata:
+        lines.extend(_SWIFTDATA_IMPORTS)
+
+    if uses_firebase:
+        lines.extend(_FIREBASE_IMPORTS)
+
+    lines.append("")
+
+    return lines
+
+def _repository_method_body(use_flow: bool, interface_name: str) -> str:
+    """
+    リポジトリのメソッド実装の本体を生成します。
+
+    Args:
+        use_flow: Flow を返すメソッドかどうか
+        interface_name: インターフェース名（Repository を除いたもの）
+
+    Returns:
+        メソッド本体のコード（メソッドの閉じ括弧と続く空行を含む）
+    """
+    if use_flow:
+        return _FLOW_BODY.substitute(iface=interface_name)
+
+    return _WITH_CONTEXT_BODY.substitute(iface=interface_name)
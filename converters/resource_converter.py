@@ -5,11 +5,42 @@
 リソースファイルを変換するモジュール
 """
 
+import codecs
+import mmap
 import os
+import re
 import shutil
 from typing import Dict, List, Any
 
-from utils.file_utils import read_file, write_file, copy_file
+from utils.file_utils import read_file_mmap, write_file, copy_file
+
+# Localizable.strings の "key" = "value"; 形式の行（コメント行を除く）
+# キーは空白以外の文字から始まるものに限定し、行頭の空白の分け方による後戻りと、
+# 字下げされたコメント行への一致を防ぐ
+_STRINGS_RE = re.compile(rb'^[ \t]*(?![ \t]|//)([^=\r\n]+)=([^\r\n]*;)[ \t\r]*$', re.MULTILINE)
+
+# Xcode が Localizable.strings の保存に使うことのある UTF-16 の BOM
+_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# strings.xml の先頭（Localizable.strings から抽出した文字列はこの後に続く）
+_STRINGS_XML_HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<resources>
+    <string name="app_name">MyApp</string>
+"""
+
+# strings.xml の末尾（デフォルトの文字列リソース）
+_STRINGS_XML_FOOTER = """    <string name="hello_world">Hello, World!</string>
+    <string name="login">Login</string>
+    <string name="signup">Sign Up</string>
+    <string name="logout">Logout</string>
+    <string name="settings">Settings</string>
+    <string name="profile">Profile</string>
+    <string name="home">Home</string>
+    <string name="search">Search</string>
+    <string name="notifications">Notifications</string>
+    <string name="error_message">An error occurred. Please try again.</string>
+</resources>
+"""
 
 def convert_resources(from_dir: str, output_dir: str, project_info: Dict[str, Any]) -> None:
     """
@@ -22,9 +53,10 @@ def convert_resources(from_dir: str, output_dir: str, project_info: Dict[str, An
     """
     print("リソースファイルを変換しています...")
 
-    # リソースディレクトリを作成
+    # リソースディレクトリを作成（各変換関数が書き込むディレクトリもここでまとめて作成）
     res_dir = os.path.join(output_dir, 'app/src/main/res')
-    os.makedirs(res_dir, exist_ok=True)
+    for directory in ['drawable', 'values', 'values-night']:
+        os.makedirs(os.path.join(res_dir, directory), exist_ok=True)
 
     # 画像リソースを変換
     convert_image_resources(from_dir, res_dir, project_info)
@@ -49,58 +81,54 @@ def convert_image_resources(from_dir: str, res_dir: str, project_info: Dict[str,
         res_dir: 出力先のリソースディレクトリ
         project_info: プロジェクト情報
     """
-    # 画像リソースディレクトリを作成
+    # 画像リソースディレクトリ
     drawable_dir = os.path.join(res_dir, 'drawable')
-    os.makedirs(drawable_dir, exist_ok=True)
 
     # iOS のリソースディレクトリ
     ios_resources_dir = os.path.join(from_dir, 'Resources')
 
-    # リソースディレクトリが存在する場合
-    if os.path.exists(ios_resources_dir):
-        # 画像ファイルをコピー
-        for root, _, files in os.walk(ios_resources_dir):
-            for file in files:
-                if file.endswith(('.png', '.jpg', '.jpeg', '.webp')):
-                    # ファイルパス
-                    file_path = os.path.join(root, file)
+    # 画像ファイルをコピー（os.walk は存在しないディレクトリでは何も返さないため、事前の存在確認は不要）
+    for root, _, files in os.walk(ios_resources_dir):
+        for file in files:
+            if file.endswith(('.png', '.jpg', '.jpeg', '.webp')):
+                # ファイルパス
+                file_path = os.path.join(root, file)
 
-                    # ファイル名を Android 形式に変換（小文字、スペースをアンダースコアに）
-                    android_filename = file.lower().replace(' ', '_')
+                # ファイル名を Android 形式に変換（小文字、スペースをアンダースコアに）
+                android_filename = file.lower().replace(' ', '_')
 
-                    # 出力先パス
-                    output_path = os.path.join(drawable_dir, android_filename)
+                # 出力先パス
+                output_path = os.path.join(drawable_dir, android_filename)
 
-                    # ファイルをコピー
-                    shutil.copy2(file_path, output_path)
-                    print(f"画像リソースをコピーしました: {file} -> {android_filename}")
+                # ファイルをコピー
+                shutil.copy2(file_path, output_path)
+                print(f"画像リソースをコピーしました: {file} -> {android_filename}")
 
-    # Assets.xcassets ディレクトリが存在する場合
+    # Assets.xcassets ディレクトリのイメージセットから画像をコピー
     assets_dir = os.path.join(from_dir, 'Assets.xcassets')
-    if os.path.exists(assets_dir):
-        for root, dirs, _ in os.walk(assets_dir):
-            for dir_name in dirs:
-                if dir_name.endswith('.imageset'):
-                    # イメージセットディレクトリ
-                    imageset_dir = os.path.join(root, dir_name)
-
-                    # イメージセット内の画像ファイルを探す
-                    for img_root, _, img_files in os.walk(imageset_dir):
-                        for img_file in img_files:
-                            if img_file.endswith(('.png', '.jpg', '.jpeg', '.webp')):
-                                # ファイルパス
-                                img_path = os.path.join(img_root, img_file)
-
-                                # ファイル名を Android 形式に変換
-                                android_filename = dir_name.replace('.imageset', '').lower().replace(' ', '_') + '.png'
-
-                                # 出力先パス
-                                output_path = os.path.join(drawable_dir, android_filename)
-
-                                # ファイルをコピー
-                                shutil.copy2(img_path, output_path)
-                                print(f"画像リソースをコピーしました: {img_file} -> {android_filename}")
-                                break  # 最初の画像ファイルだけをコピー
+    for root, dirs, _ in os.walk(assets_dir):
+        for dir_name in dirs:
+            if dir_name.endswith('.imageset'):
+                # イメージセットディレクトリ
+                imageset_dir = os.path.join(root, dir_name)
+
+                # イメージセット内の画像ファイルを探す
+                for img_root, _, img_files in os.walk(imageset_dir):
+                    for img_file in img_files:
+                        if img_file.endswith(('.png', '.jpg', '.jpeg', '.webp')):
+                            # ファイルパス
+                            img_path = os.path.join(img_root, img_file)
+
+                            # ファイル名を Android 形式に変換
+                            android_filename = dir_name.replace('.imageset', '').lower().replace(' ', '_') + '.png'
+
+                            # 出力先パス
+                            output_path = os.path.join(drawable_dir, android_filename)
+
+                            # ファイルをコピー
+                            shutil.copy2(img_path, output_path)
+                            print(f"画像リソースをコピーしました: {img_file} -> {android_filename}")
+                            break  # 最初の画像ファイルだけをコピー
 
 def convert_string_resources(from_dir: str, res_dir: str, project_info: Dict[str, Any]) -> None:
     """
@@ -111,9 +139,8 @@ def convert_string_resources(from_dir: str, res_dir: str, project_info: Dict[str
         res_dir: 出力先のリソースディレクトリ
         project_info: プロジェクト情報
     """
-    # 文字列リソースディレクトリを作成
+    # 文字列リソースディレクトリ
     values_dir = os.path.join(res_dir, 'values')
-    os.makedirs(values_dir, exist_ok=True)
 
     # strings.xml ファイルのパス
     strings_xml_path = os.path.join(values_dir, 'strings.xml')
@@ -121,54 +148,42 @@ def convert_string_resources(from_dir: str, res_dir: str, project_info: Dict[str
     # iOS の Localizable.strings ファイルのパス
     localizable_strings_path = os.path.join(from_dir, 'Resources/Localizable.strings')
 
-    # 文字列リソースの内容
-    strings_xml_content = """<?xml version="1.0" encoding="utf-8"?>
-<resources>
-    <string name="app_name">MyApp</string>
-"""
+    # 文字列リソースの内容（最後に一度だけ結合する）
+    parts = [_STRINGS_XML_HEADER]
 
-    # Localizable.strings ファイルが存在する場合
-    if os.path.exists(localizable_strings_path):
-        # ファイルの内容を読み込み
-        content = read_file(localizable_strings_path)
-
-        # 文字列リソースを抽出
-        for line in content.splitlines():
-            line = line.strip()
+    # Localizable.strings ファイルをメモリマップして読み込み（存在しない場合は空として扱う）
+    try:
+        content = read_file_mmap(localizable_strings_path)
+    except FileNotFoundError:
+        content = b''
 
-            # コメント行をスキップ
-            if line.startswith('//') or not line:
-                continue
+    try:
+        # UTF-16 のファイルは bytes パターンに一致しないため、UTF-8 に変換してから走査する
+        # （UTF-16 として正しくない場合は UnicodeDecodeError で失敗させ、文字列を黙って落とさない）
+        data = content
+        if content[:2] in _UTF16_BOMS:
+            data = content[:].decode('utf-16').encode('utf-8')
 
-            # "key" = "value"; の形式を解析
-            if '=' in line and line.endswith(';'):
-                parts = line.split('=', 1)
-                if len(parts) == 2:
-                    key = parts[0].strip().strip('"')
-                    value = parts[1].strip().strip(';').strip().strip('"')
+        # 文字列リソースを抽出
+        for match in _STRINGS_RE.finditer(data):
+            key = match.group(1).decode('utf-8').strip().strip('"')
+            value = match.group(2).decode('utf-8').strip().strip(';').strip().strip('"')
 
-                    # Android の文字列リソース名に変換（小文字、スペースをアンダースコアに）
-                    android_key = key.lower().replace(' ', '_')
+            # Android の文字列リソース名に変換（小文字、スペースをアンダースコアに）
+            android_key = key.lower().replace(' ', '_')
 
-                    # 文字列リソースを追加
-                    strings_xml_content += f'    <string name="{android_key}">{value}</string>\n'
+            # 文字列リソースを追加
+            parts.append(f'    <string name="{android_key}">{value}</string>\n')
+    finally:
+        # メモリマップは走査が終わったら閉じる（空のファイルや存在しない場合の bytes は閉じる必要がない）
+        if isinstance(content, mmap.mmap):
+            content.close()
 
     # デフォルトの文字列リソースを追加
-    strings_xml_content += """    <string name="hello_world">Hello, World!</string>
-    <string name="login">Login</string>
-    <string name="signup">Sign Up</string>
-    <string name="logout">Logout</string>
-    <string name="settings">Settings</string>
-    <string name="profile">Profile</string>
-    <string name="home">Home</string>
-    <string name="search">Search</string>
-    <string name="notifications">Notifications</string>
-    <string name="error_message">An error occurred. Please try again.</string>
-</resources>
-"""
+    parts.append(_STRINGS_XML_FOOTER)
 
     # strings.xml ファイルを書き込み
-    write_file(strings_xml_path, strings_xml_content)
+    write_file(strings_xml_path, "".join(parts))
     print(f"文字列リソースを作成しました: {strings_xml_path}")
 
 def convert_color_resources(from_dir: str, res_dir: str, project_info: Dict[str, Any]) -> None:
@@ -180,9 +195,8 @@ def convert_color_resources(from_dir: str, res_dir: str, project_info: Dict[str,
         res_dir: 出力先のリソースディレクトリ
         project_info: プロジェクト情報
     """
-    # カラーリソースディレクトリを作成
+    # カラーリソースディレクトリ
     values_dir = os.path.join(res_dir, 'values')
-    os.makedirs(values_dir, exist_ok=True)
 
     # colors.xml ファイルのパス
     colors_xml_path = os.path.join(values_dir, 'colors.xml')
@@ -219,9 +233,8 @@ def create_theme(res_dir: str) -> None:
     Args:
         res_dir: 出力先のリソースディレクトリ
     """
-    # テーマディレクトリを作成
+    # テーマディレクトリ
     values_dir = os.path.join(res_dir, 'values')
-    os.makedirs(values_dir, exist_ok=True)
 
     # themes.xml ファイルのパス
     themes_xml_path = os.path.join(values_dir, 'themes.xml')
@@ -256,9 +269,8 @@ def create_theme(res_dir: str) -> None:
     write_file(themes_xml_path, themes_xml_content)
     print(f"テーマを作成しました: {themes_xml_path}")
 
-    # ナイトモード用のテーマディレクトリを作成
+    # ナイトモード用のテーマディレクトリ
     night_values_dir = os.path.join(res_dir, 'values-night')
-    os.makedirs(night_values_dir, exist_ok=True)
 
     # ナイトモード用の themes.xml ファイルのパス
     night_themes_xml_path = os.path.join(night_values_dir, 'themes.xml')
@@ -5,12 +5,73 @@
 Swift のサービスを Kotlin のサービスに変換するモジュール
 """
 
+import logging
 import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Tuple
+
+from utils.file_utils import DIRECT_IO, ensure_directory, write_file_direct, write_lines, get_filename
+from utils.incremental import convert_changed_files
+from utils.parallel import project_flags
+from utils.parser import parse_swift_file_cached, swift_type_to_kotlin
+
+logger = logging.getLogger(__name__)
+
+# 以下のインポートは行の区切りを含む文字列（末尾の改行なし）
+
+# 共通のインポート
+_BASE_IMPORTS = (
+    "import kotlinx.coroutines.Dispatchers\n"
+    "import kotlinx.coroutines.withContext"
+)
+
+# Firebase を使用している場合のインポート
+_FIREBASE_IMPORTS = (
+    "import com.google.firebase.auth.FirebaseAuth\n"
+    "import com.google.firebase.auth.FirebaseUser\n"
+    "import kotlinx.coroutines.tasks.await"
+)
+
+# ネットワーク関連のインポート
+_KTOR_IMPORTS = (
+    "import io.ktor.client.*\n"
+    "import io.ktor.client.engine.android.*\n"
+    "import io.ktor.client.features.json.*\n"
+    "import io.ktor.client.features.json.serializer.*\n"
+    "import io.ktor.client.request.*\n"
+    "import io.ktor.http.*"
+)
+
+# 実装クラスの宣言と HTTP クライアント（str.format 用、Kotlin の波括弧は二重にしてエスケープ）
+_IMPL_HEADER = """\
+class {class_name}Impl : {interface_name} {{
+    private val client = HttpClient(Android) {{
+        install(JsonFeature) {{
+            serializer = KotlinxSerializer(kotlinx.serialization.json.Json {{
+                prettyPrint = true
+                isLenient = true
+                ignoreUnknownKeys = true
+            }})
+        }}
+    }}
+"""
 
-from utils.file_utils import read_file, write_file, get_filename
-from utils.parser import parse_swift_file, swift_type_to_kotlin, swift_method_to_kotlin
+# 実装クラスのメソッドの内容（閉じ括弧まで、末尾の改行なし）
+_METHOD_BODY = """\
+        return withContext(Dispatchers.IO) {
+            try {
+                // TODO: 実装
+                // API リクエストの例:
+                // client.get<ResponseType> {
+                //     url("https://api.example.com/endpoint")
+                //     contentType(ContentType.Application.Json)
+                // }
+            } catch (e: Exception) {
+                // エラー処理
+                throw e
+            }
+        }
+    }"""
 
 def convert_services(from_dir: str, package_dir: str, project_info: Dict[str, Any], package_name: str) -> None:
     """
@@ -22,35 +83,44 @@ def convert_services(from_dir: str, package_dir: str, project_info: Dict[str, An
         project_info: プロジェクト情報
         package_name: Android アプリのパッケージ名
     """
-    print("サービスを変換しています...")
+    logger.info("サービスを変換しています...")
 
     services_dir = os.path.join(package_dir, 'services')
-    os.makedirs(services_dir, exist_ok=True)
+    ensure_directory(services_dir)
 
-    for service_path in project_info['services']:
-        full_path = os.path.join(from_dir, service_path)
-        if not os.path.exists(full_path):
-            print(f"警告: サービスファイルが見つかりません: {full_path}")
-            continue
+    # ワーカーにはプロジェクト情報全体ではなく、生成で参照するフラグだけを渡す
+    flags = project_flags(project_info)
 
-        print(f"サービスを変換しています: {service_path}")
+    def plan(service_path: str) -> Tuple[str, Tuple[str, Dict[str, bool]]]:
+        # 出力先のパスと、変換に渡す引数を決定
+        filename = get_filename(service_path)
+        kotlin_path = os.path.join(services_dir, f"{filename}.kt")
+        return kotlin_path, (package_name, flags)
 
-        # Swift ファイルを解析
-        swift_content = read_file(full_path)
-        service_info = parse_swift_file(swift_content)
+    # 前回の変換から変更されたファイルだけを並列に変換
+    convert_changed_files("サービス", from_dir, project_info['services'], plan, _convert_one_service, project_info, package_name)
 
-        # Kotlin サービスを生成
-        kotlin_content = generate_kotlin_service(service_info, package_name, project_info)
+def _convert_one_service(full_path: str, kotlin_path: str, args: Tuple[str, Dict[str, bool]]) -> None:
+    """
+    1 つのサービスファイルを変換して書き込みます。ワーカープロセスで実行されます。
 
-        # ファイル名を決定
-        filename = get_filename(service_path)
-        kotlin_filename = f"{filename}.kt"
+    Args:
+        full_path: Swift ファイルのパス
+        kotlin_path: 出力先のパス
+        args: (パッケージ名, プロジェクトのフラグ) のタプル
+    """
+    package_name, flags = args
 
-        # Kotlin ファイルを書き込み
-        kotlin_path = os.path.join(services_dir, kotlin_filename)
-        write_file(kotlin_path, kotlin_content)
+    # Swift ファイルを解析（同じファイルの再解析はキャッシュで省略）
+    service_info = parse_swift_file_cached(full_path)
 
-        print(f"サービスを変換しました: {kotlin_path}")
+    lines = _emit_kotlin_service(service_info, package_name, flags)
+    if DIRECT_IO:
+        # O_DIRECT ではまとめて書き込む必要があるため、内容を結合してから書き込み
+        write_file_direct(kotlin_path, "\n".join(lines))
+    else:
+        # Kotlin サービスを生成しながらファイルに書き込み
+        write_lines(kotlin_path, lines)
 
 def generate_kotlin_service(service_info: Dict[str, Any], package_name: str, project_info: Dict[str, Any]) -> str:
     """
@@ -59,127 +129,80 @@ def generate_kotlin_service(service_info: Dict[str, Any], package_name: str, pro
     Args:
         service_info: Swift サービスの情報
         package_name: Android アプリのパッケージ名
-        project_info: プロジェクト情報
+        project_info: プロジェクト情報（uses_firebase のフラグだけを参照）
 
     Returns:
         生成された Kotlin サービスのコード
     """
+    return "\n".join(_emit_kotlin_service(service_info, package_name, project_info))
+
+def _emit_kotlin_service(service_info: Dict[str, Any], package_name: str, project_info: Dict[str, Any]) -> Iterator[str]:
+    """
+    Kotlin のサービスのコードを 1 行ずつ生成します。
+
+    Args:
+        service_info: Swift サービスの情報
+        package_name: Android アプリのパッケージ名
+        project_info: プロジェクト情報
+
+    Returns:
+        コードの行のイテレータ（改行は含まない）
+    """
     class_name = service_info['class_name']
 
     # パッケージとインポート
-    lines = [
-        f"package {package_name}.services",
-        "",
-        "import kotlinx.coroutines.Dispatchers",
-        "import kotlinx.coroutines.withContext",
-        f"import {package_name}.models.*"
-    ]
+    yield f"package {package_name}.services"
+    yield ""
+    yield _BASE_IMPORTS
+    yield f"import {package_name}.models.*"
 
     # Firebase を使用している場合
     if service_info['uses_firebase'] or project_info['uses_firebase']:
-        lines.extend([
-            "import com.google.firebase.auth.FirebaseAuth",
-            "import com.google.firebase.auth.FirebaseUser",
-            "import kotlinx.coroutines.tasks.await"
-        ])
+        yield _FIREBASE_IMPORTS
 
     # ネットワーク関連のインポート
-    lines.extend([
-        "import io.ktor.client.*",
-        "import io.ktor.client.engine.android.*",
-        "import io.ktor.client.features.json.*",
-        "import io.ktor.client.features.json.serializer.*",
-        "import io.ktor.client.request.*",
-        "import io.ktor.http.*"
-    ])
+    yield _KTOR_IMPORTS
 
-    lines.append("")
+    yield ""
 
     # インターフェース定義
     interface_name = class_name
-    lines.extend([
-        f"interface {interface_name} {{",
-    ])
-
-    # メソッドのインターフェース定義
-    for method in service_info['methods']:
-        method_name = method['name']
-        parameters = method['parameters']
-        return_type = method['return_type']
+    yield f"interface {interface_name} {{"
 
-        # Swift のメソッドを Kotlin のメソッドに変換
-        kotlin_method_name, kotlin_parameters, kotlin_return_type = swift_method_to_kotlin(
-            method_name, parameters, return_type
-        )
+    # 解析時に Kotlin に変換済みのメソッドのシグネチャ（インターフェースと実装の両方で使う）
+    methods = service_info['methods_soa']
+    names, params, rets = methods['names'], methods['params'], methods['rets']
 
+    # メソッドのインターフェース定義
+    for kotlin_method_name, kotlin_parameters, kotlin_return_type in zip(names, params, rets):
         # メソッド定義
         if kotlin_parameters:
-            lines.append(f"    suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type}")
+            yield f"    suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type}"
         else:
-            lines.append(f"    suspend fun {kotlin_method_name}(): {kotlin_return_type}")
+            yield f"    suspend fun {kotlin_method_name}(): {kotlin_return_type}"
 
-    lines.append("}")
-    lines.append("")
+    yield "}"
+    yield ""
 
     # 実装クラス
-    lines.extend([
-        f"class {class_name}Impl : {interface_name} {{",
-        "    private val client = HttpClient(Android) {",
-        "        install(JsonFeature) {",
-        "            serializer = KotlinxSerializer(kotlinx.serialization.json.Json {",
-        "                prettyPrint = true",
-        "                isLenient = true",
-        "                ignoreUnknownKeys = true",
-        "            })",
-        "        }",
-        "    }",
-        ""
-    ])
+    yield _IMPL_HEADER.format(class_name=class_name, interface_name=interface_name)
 
     # Firebase を使用している場合
     if service_info['uses_firebase'] or project_info['uses_firebase']:
-        lines.extend([
-            "    private val auth = FirebaseAuth.getInstance()",
-            ""
-        ])
+        yield "    private val auth = FirebaseAuth.getInstance()"
+        yield ""
 
     # メソッドの実装
-    for method in service_info['methods']:
-        method_name = method['name']
-        parameters = method['parameters']
-        return_type = method['return_type']
-
-        # Swift のメソッドを Kotlin のメソッドに変換
-        kotlin_method_name, kotlin_parameters, kotlin_return_type = swift_method_to_kotlin(
-            method_name, parameters, return_type
-        )
-
+    for kotlin_method_name, kotlin_parameters, kotlin_return_type in zip(names, params, rets):
         # メソッド実装
         if kotlin_parameters:
-            lines.append(f"    override suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type} {{")
+            yield f"    override suspend fun {kotlin_method_name}({kotlin_parameters}): {kotlin_return_type} {{"
         else:
-            lines.append(f"    override suspend fun {kotlin_method_name}(): {kotlin_return_type} {{")
-
-        # メソッドの内容
-        lines.extend([
-            "        return withContext(Dispatchers.IO) {",
-            "            try {",
-            "                // TODO: 実装",
-            "                // API リクエストの例:",
-            "                // client.get<ResponseType> {",
-            "                //     url(\"https://api.example.com/endpoint\")",
-            "                //     contentType(ContentType.Application.Json)",
-            "                // }",
-            "            } catch (e: Exception) {",
-            "                // エラー処理",
-            "                throw e",
-            "            }",
-            "        }",
-        ])
-
-        lines.append("    }")
-        lines.append("")
-
-    lines.append("}")
-
-    return "\n".join(lines)
\ No newline at end of file
+            yield f"    override suspend fun {kotlin_method_name}(): {kotlin_return_type} {{"
+
+        # メソッドの内容（戻り値の型によらず共通）
+        yield _METHOD_BODY
+
+        yield ""
+
+    yield "}"
\ No newline at end of file
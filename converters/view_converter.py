@@ -5,12 +5,105 @@
 SwiftUI のビューを Jetpack Compose のビューに変換するモジュール
 """
 
+import logging
 import os
 import re
-from typing import Dict, List, Any
-
-from utils.file_utils import read_file, write_file, get_filename
-from utils.parser import parse_swift_file
+from typing import Dict, List, Any, Tuple
+
+from utils.file_utils import ensure_directory, read_file, write_file_direct, get_filename
+from utils.incremental import convert_changed_files
+from utils.parser import parse_swift_content_cached
+
+logger = logging.getLogger(__name__)
+
+# 画面を示す特徴
+_SCREEN_INDICATORS = (
+    'Screen', 'Page', 'View', 'Activity', 'Fragment',
+    'NavigationView', 'TabView', 'NavigationLink',
+    '@main', 'App', 'Scene', 'WindowGroup'
+)
+
+# コンポーネントを示す特徴
+_COMPONENT_INDICATORS = (
+    'Button', 'Text', 'Image', 'List', 'Form', 'Section',
+    'TextField', 'Toggle', 'Picker', 'Slider', 'Stepper',
+    'ProgressView', 'Label', 'Link', 'Menu', 'Divider'
+)
+
+# 各特徴のいずれかを含むかを一度の走査で判定する正規表現
+_SCREEN_INDICATOR_RE = re.compile('|'.join(map(re.escape, _SCREEN_INDICATORS)))
+_COMPONENT_INDICATOR_RE = re.compile('|'.join(map(re.escape, _COMPONENT_INDICATORS)))
+
+# 以下は str.format 用のテンプレート（Kotlin の波括弧は二重にしてエスケープ）
+
+# 画面・コンポーネント共通のインポート
+_IMPORTS = """\
+import androidx.compose.foundation.layout.*
+import androidx.compose.material3.*
+import androidx.compose.runtime.*
+import androidx.compose.ui.Alignment
+import androidx.compose.ui.Modifier
+import androidx.compose.ui.unit.dp
+import androidx.lifecycle.viewmodel.compose.viewModel
+import {package_name}.viewmodels.*
+import {package_name}.models.*
+import {package_name}.ui.theme.*"""
+
+# 基本的なレイアウト
+_LAYOUT = """\
+    Surface(
+        modifier = modifier.fillMaxSize(),
+        color = MaterialTheme.colorScheme.background
+    ) {{
+        Column(
+            modifier = Modifier
+                .fillMaxSize()
+                .padding(16.dp),
+            horizontalAlignment = Alignment.CenterHorizontally,
+            verticalArrangement = Arrangement.Center
+        ) {{
+            // TODO: ここにコンテンツを追加
+            Text(text = "Hello, Compose!")
+        }}
+    }}
+}}"""
+
+# 画面のテンプレート
+_SCREEN_TEMPLATE = "package {package}\n\n" + _IMPORTS + """
+import androidx.navigation.NavController
+import androidx.navigation.compose.rememberNavController
+
+@Composable
+fun {class_name}Screen(
+    navController: NavController = rememberNavController(),
+    viewModel: {class_name}ViewModel = viewModel()
+) {{
+""" + _LAYOUT + """
+
+@Preview(showBackground = true)
+@Composable
+fun {class_name}Preview() {{
+    AppTheme {{
+        {class_name}Screen()
+    }}
+}}"""
+
+# コンポーネントのテンプレート
+_COMPONENT_TEMPLATE = "package {package}\n\n" + _IMPORTS + """
+
+@Composable
+fun {class_name}(
+    modifier: Modifier = Modifier
+) {{
+""" + _LAYOUT + """
+
+@Preview(showBackground = true)
+@Composable
+fun {class_name}Preview() {{
+    AppTheme {{
+        {class_name}()
+    }}
+}}"""
 
 def convert_views(from_dir: str, package_dir: str, project_info: Dict[str, Any], package_name: str) -> None:
     """
@@ -22,49 +115,52 @@ def convert_views(from_dir: str, package_dir: str, project_info: Dict[str, Any],
         project_info: プロジェクト情報
         package_name: Android アプリのパッケージ名
     """
-    print("ビューを変換しています...")
+    logger.info("ビューを変換しています...")
 
     screens_dir = os.path.join(package_dir, 'ui/screens')
     components_dir = os.path.join(package_dir, 'ui/components')
 
-    os.makedirs(screens_dir, exist_ok=True)
-    os.makedirs(components_dir, exist_ok=True)
-
-    for view_path in project_info['views']:
-        full_path = os.path.join(from_dir, view_path)
-        if not os.path.exists(full_path):
-            print(f"警告: ビューファイルが見つかりません: {full_path}")
-            continue
+    ensure_directory(screens_dir)
+    ensure_directory(components_dir)
 
-        print(f"ビューを変換しています: {view_path}")
+    def plan(view_path: str) -> Tuple[str, Tuple[bool, str]]:
+        # 画面かコンポーネントかはファイル名だけで決まるため、出力先はここで決定
+        filename = get_filename(view_path)
+        is_screen = is_screen_view(filename, "")
+        output_dir = screens_dir if is_screen else components_dir
+        kotlin_path = os.path.join(output_dir, f"{filename}.kt")
+        return kotlin_path, (is_screen, package_name)
 
-        # Swift ファイルを解析
-        swift_content = read_file(full_path)
-        view_info = parse_swift_file(swift_content)
+    # 前回の変換から変更されたファイルだけを並列に変換
+    convert_changed_files("ビュー", from_dir, project_info['views'], plan, _convert_one_view, project_info, package_name)
 
-        # Jetpack Compose のビューを生成
-        kotlin_content = generate_compose_view(view_info, package_name)
+def _convert_one_view(full_path: str, kotlin_path: str, args: Tuple[bool, str]) -> None:
+    """
+    1 つのビューファイルを変換して書き込みます。ワーカープロセスで実行されます。
 
-        # ファイル名を決定
-        filename = get_filename(view_path)
-        kotlin_filename = f"{filename}.kt"
+    Args:
+        full_path: Swift ファイルのパス
+        kotlin_path: 出力先のパス
+        args: (画面かどうか, パッケージ名) のタプル
+    """
+    is_screen, package_name = args
 
-        # 画面かコンポーネントかを判断
-        if is_screen_view(filename, swift_content):
-            output_dir = screens_dir
-        else:
-            output_dir = components_dir
+    # Swift ファイルを解析（内容が同じファイルの再解析はキャッシュで省略）
+    view_info = parse_swift_content_cached(read_file(full_path))
 
-        # Kotlin ファイルを書き込み
-        kotlin_path = os.path.join(output_dir, kotlin_filename)
-        write_file(kotlin_path, kotlin_content)
+    # Jetpack Compose のビューを生成（パッケージは出力先のディレクトリに合わせる）
+    kotlin_content = generate_compose_view(view_info, package_name, is_screen)
 
-        print(f"ビューを変換しました: {kotlin_path}")
+    # Kotlin ファイルを書き込み
+    write_file_direct(kotlin_path, kotlin_content)
 
 def is_screen_view(filename: str, content: str) -> bool:
     """
     ビューが画面かコンポーネントかを判断します。
 
+    ファイル名にコンポーネントを示す特徴だけが含まれる場合はコンポーネント、それ以外は画面として扱います。
+    内容に基づく判断（NavigationView などを含むか）はどちらの場合も画面になるため、内容は走査しません。
+
     Args:
         filename: ファイル名
         content: ファイルの内容
@@ -72,129 +168,39 @@ def is_screen_view(filename: str, content: str) -> bool:
     Returns:
         画面の場合は True、コンポーネントの場合は False
     """
-    # 画面を示す特徴
-    screen_indicators = [
-        'Screen', 'Page', 'View', 'Activity', 'Fragment',
-        'NavigationView', 'TabView', 'NavigationLink',
-        '@main', 'App', 'Scene', 'WindowGroup'
-    ]
-
-    # コンポーネントを示す特徴
-    component_indicators = [
-        'Button', 'Text', 'Image', 'List', 'Form', 'Section',
-        'TextField', 'Toggle', 'Picker', 'Slider', 'Stepper',
-        'ProgressView', 'Label', 'Link', 'Menu', 'Divider'
-    ]
-
     # ファイル名に基づく判断
-    for indicator in screen_indicators:
-        if indicator in filename:
-            return True
-
-    for indicator in component_indicators:
-        if indicator in filename and not any(screen in filename for screen in screen_indicators):
-            return False
-
-    # 内容に基づく判断
-    if 'NavigationView' in content or 'TabView' in content or '@main' in content:
+    if _SCREEN_INDICATOR_RE.search(filename):
         return True
 
+    if _COMPONENT_INDICATOR_RE.search(filename):
+        return False
+
     # デフォルトでは画面として扱う
     return True
 
-def generate_compose_view(view_info: Dict[str, Any], package_name: str) -> str:
+def generate_compose_view(view_info: Dict[str, Any], package_name: str, is_screen: bool) -> str:
     """
     SwiftUI のビュー情報から Jetpack Compose のビューを生成します。
 
     Args:
         view_info: SwiftUI ビューの情報
         package_name: Android アプリのパッケージ名
+        is_screen: 画面の場合は True（is_screen_view で判断した結果）
 
     Returns:
         生成された Jetpack Compose のコード
     """
     class_name = view_info['class_name']
 
-    # 画面かコンポーネントかを判断
-    is_screen = is_screen_view(class_name, "")
-
-    # パッケージとインポート
-    if is_screen:
-        package = f"{package_name}.ui.screens"
-    else:
-        package = f"{package_name}.ui.components"
-
-    lines = [
-        f"package {package}",
-        "",
-        "import androidx.compose.foundation.layout.*",
-        "import androidx.compose.material3.*",
-        "import androidx.compose.runtime.*",
-        "import androidx.compose.ui.Alignment",
-        "import androidx.compose.ui.Modifier",
-        "import androidx.compose.ui.unit.dp",
-        "import androidx.lifecycle.viewmodel.compose.viewModel",
-        f"import {package_name}.viewmodels.*",
-        f"import {package_name}.models.*",
-        f"import {package_name}.ui.theme.*"
-    ]
-
-    # 画面の場合は追加のインポート
-    if is_screen:
-        lines.extend([
-            "import androidx.navigation.NavController",
-            "import androidx.navigation.compose.rememberNavController"
-        ])
-
-    lines.append("")
-
-    # Composable 関数
     if is_screen:
-        lines.append("@Composable")
-        lines.append(f"fun {class_name}Screen(")
-        lines.append("    navController: NavController = rememberNavController(),")
-
-        # ViewModel があれば追加
-        viewmodel_name = f"{class_name}ViewModel"
-        lines.append(f"    viewModel: {viewmodel_name} = viewModel()")
-
-        lines.append(") {")
-    else:
-        lines.append("@Composable")
-        lines.append(f"fun {class_name}(")
-        lines.append("    modifier: Modifier = Modifier")
-        lines.append(") {")
-
-    # 基本的なレイアウト
-    lines.extend([
-        "    Surface(",
-        "        modifier = modifier.fillMaxSize(),",
-        "        color = MaterialTheme.colorScheme.background",
-        "    ) {",
-        "        Column(",
-        "            modifier = Modifier",
-        "                .fillMaxSize()",
-        "                .padding(16.dp),",
-        "            horizontalAlignment = Alignment.CenterHorizontally,",
-        "            verticalArrangement = Arrangement.Center",
-        "        ) {",
-        "            // TODO: ここにコンテンツを追加",
-        "            Text(text = \"Hello, Compose!\")",
-        "        }",
-        "    }",
-        "}"
-    ])
-
-    # プレビュー関数
-    lines.extend([
-        "",
-        "@Preview(showBackground = true)",
-        "@Composable",
-        f"fun {class_name}Preview() {{",
-        f"    AppTheme {{",
-        f"        {class_name}()" if not is_screen else f"        {class_name}Screen()",
-        f"    }}",
-        f"}}"
-    ])
-
-    return "\n".join(lines)
\ No newline at end of file
+        return _SCREEN_TEMPLATE.format(
+            package=f"{package_name}.ui.screens",
+            package_name=package_name,
+            class_name=class_name,
+        )
+
+    return _COMPONENT_TEMPLATE.format(
+        package=f"{package_name}.ui.components",
+        package_name=package_name,
+        class_name=class_name,
+    )
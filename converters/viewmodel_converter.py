@@ -5,12 +5,81 @@
 Swift の ViewModel を Kotlin の ViewModel に変換するモジュール
 """
 
+import logging
 import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+from utils.file_utils import ensure_directory, read_file, write_file, get_filename
+from utils.incremental import convert_changed_files
+from utils.parallel import project_flags
+from utils.parser import parse_swift_content_cached, swift_type_to_kotlin
+
+logger = logging.getLogger(__name__)
+
+# 以下は複数行を含む文字列で、行のリストにそのまま追加して最後に一度だけ結合する
+
+# パッケージとインポート（str.format 用）
+_HEADER = """\
+package {package_name}.viewmodels
+
+import androidx.lifecycle.ViewModel
+import androidx.lifecycle.viewModelScope
+import kotlinx.coroutines.flow.MutableStateFlow
+import kotlinx.coroutines.flow.StateFlow
+import kotlinx.coroutines.flow.asStateFlow
+import kotlinx.coroutines.launch
+import {package_name}.models.*
+import {package_name}.repositories.*"""
+
+# Published プロパティに対応する StateFlow（str.format 用）
+_STATE_PROPERTY = """\
+    private val _{name} = MutableStateFlow<{type}>(/* 初期値 */)
+    val {name}: StateFlow<{type}> = _{name}.asStateFlow()
+"""
+
+# Published プロパティがない場合のデフォルトの状態
+_DEFAULT_UI_STATE = """\
+    private val _uiState = MutableStateFlow(UiState())
+    val uiState: StateFlow<UiState> = _uiState.asStateFlow()
 
-from utils.file_utils import read_file, write_file, get_filename
-from utils.parser import parse_swift_file, swift_type_to_kotlin
+    data class UiState(
+        val isLoading: Boolean = false,
+        val errorMessage: String? = null
+    )
+"""
+
+# 初期化ブロック
+_INIT_BLOCK = """\
+    init {
+        // 初期化処理
+        loadData()
+    }
+"""
+
+# メソッドの内容（閉じ括弧まで）
+_METHOD_BODY = """\
+        viewModelScope.launch {
+            try {
+                // TODO: 実装
+            } catch (e: Exception) {
+                // エラー処理
+            }
+        }
+    }
+"""
+
+# デフォルトのデータ読み込みメソッド
+_LOAD_DATA_METHOD = """\
+    private fun loadData() {
+        viewModelScope.launch {
+            try {
+                // TODO: データの読み込み処理
+            } catch (e: Exception) {
+                // エラー処理
+            }
+        }
+    }"""
 
 def convert_viewmodels(from_dir: str, package_dir: str, project_info: Dict[str, Any], package_name: str) -> None:
     """
@@ -22,35 +91,41 @@ def convert_viewmodels(from_dir: str, package_dir: str, project_info: Dict[str,
         project_info: プロジェクト情報
         package_name: Android アプリのパッケージ名
     """
-    print("ViewModel を変換しています...")
+    logger.info("ViewModel を変換しています...")
 
     viewmodels_dir = os.path.join(package_dir, 'viewmodels')
-    os.makedirs(viewmodels_dir, exist_ok=True)
+    ensure_directory(viewmodels_dir)
 
-    for viewmodel_path in project_info['viewmodels']:
-        full_path = os.path.join(from_dir, viewmodel_path)
-        if not os.path.exists(full_path):
-            print(f"警告: ViewModel ファイルが見つかりません: {full_path}")
-            continue
+    # ワーカーにはプロジェクト情報全体ではなく、生成で参照するフラグだけを渡す
+    flags = project_flags(project_info)
 
-        print(f"ViewModel を変換しています: {viewmodel_path}")
+    def plan(viewmodel_path: str) -> Tuple[str, Tuple[str, Dict[str, bool]]]:
+        # 出力先のパスと、変換に渡す引数を決定
+        kotlin_path = os.path.join(viewmodels_dir, f"{get_filename(viewmodel_path)}.kt")
+        return kotlin_path, (package_name, flags)
 
-        # Swift ファイルを解析
-        swift_content = read_file(full_path)
-        viewmodel_info = parse_swift_file(swift_content)
+    # 前回の変換から変更されたファイルだけを並列に変換
+    convert_changed_files("ViewModel ", from_dir, project_info['viewmodels'], plan, _convert_one_viewmodel, project_info, package_name)
 
-        # Kotlin ViewModel を生成
-        kotlin_content = generate_kotlin_viewmodel(viewmodel_info, package_name, project_info)
+def _convert_one_viewmodel(full_path: str, kotlin_path: str, args: Tuple[str, Dict[str, bool]]) -> None:
+    """
+    1 つの ViewModel ファイルを変換して書き込みます。ワーカープロセスで実行されます。
 
-        # ファイル名を決定
-        filename = get_filename(viewmodel_path)
-        kotlin_filename = f"{filename}.kt"
+    Args:
+        full_path: Swift ファイルのパス
+        kotlin_path: 出力先のパス
+        args: (パッケージ名, プロジェクトのフラグ) のタプル
+    """
+    package_name, flags = args
 
-        # Kotlin ファイルを書き込み
-        kotlin_path = os.path.join(viewmodels_dir, kotlin_filename)
-        write_file(kotlin_path, kotlin_content)
+    # Swift ファイルを解析（内容が同じファイルの再解析はキャッシュで省略）
+    viewmodel_info = parse_swift_content_cached(read_file(full_path))
 
-        print(f"ViewModel を変換しました: {kotlin_path}")
+    # Kotlin ViewModel を生成
+    kotlin_content = generate_kotlin_viewmodel(viewmodel_info, package_name, flags)
+
+    # Kotlin ファイルを書き込み
+    write_file(kotlin_path, kotlin_content)
 
 def generate_kotlin_viewmodel(viewmodel_info: Dict[str, Any], package_name: str, project_info: Dict[str, Any]) -> str:
     """
@@ -59,7 +134,7 @@ def generate_kotlin_viewmodel(viewmodel_info: Dict[str, Any], package_name: str,
     Args:
         viewmodel_info: Swift ViewModel の情報
         package_name: Android アプリのパッケージ名
-        project_info: プロジェクト情報
+        project_info: プロジェクト情報（uses_firebase のフラグだけを参照）
 
     Returns:
         生成された Kotlin ViewModel のコード
@@ -67,18 +142,7 @@ def generate_kotlin_viewmodel(viewmodel_info: Dict[str, Any], package_name: str,
     class_name = viewmodel_info['class_name']
 
     # パッケージとインポート
-    lines = [
-        f"package {package_name}.viewmodels",
-        "",
-        "import androidx.lifecycle.ViewModel",
-        "import androidx.lifecycle.viewModelScope",
-        "import kotlinx.coroutines.flow.MutableStateFlow",
-        "import kotlinx.coroutines.flow.StateFlow",
-        "import kotlinx.coroutines.flow.asStateFlow",
-        "import kotlinx.coroutines.launch",
-        f"import {package_name}.models.*",
-        f"import {package_name}.repositories.*"
-    ]
+    lines = [_HEADER.format(package_name=package_name)]
 
     # Firebase を使用している場合
     if viewmodel_info['uses_firebase'] or project_info['uses_firebase']:
@@ -106,78 +170,43 @@ def generate_kotlin_viewmodel(viewmodel_info: Dict[str, Any], package_name: str,
     # 状態を表す StateFlow
     lines.append("    // 状態")
 
-    # Published プロパティを StateFlow に変換
-    state_properties = []
-    for prop in viewmodel_info['properties']:
-        if prop['is_published']:
-            prop_name = prop['name']
-            prop_type = swift_type_to_kotlin(prop['type'].replace('@Published', '').strip())
-            state_properties.append((prop_name, prop_type))
+    # Published プロパティを StateFlow に変換（プロパティごとに複数行をまとめて生成）
+    state_properties = [
+        _STATE_PROPERTY.format(name=prop['name'], type=swift_type_to_kotlin(prop['type'].replace('@Published', '').strip()))
+        for prop in viewmodel_info['properties']
+        if prop['is_published']
+    ]
 
     if state_properties:
-        for prop_name, prop_type in state_properties:
-            lines.extend([
-                f"    private val _{prop_name} = MutableStateFlow<{prop_type}>(/* 初期値 */)",
-                f"    val {prop_name}: StateFlow<{prop_type}> = _{prop_name}.asStateFlow()",
-                ""
-            ])
+        lines.extend(state_properties)
     else:
         # デフォルトの状態
-        lines.extend([
-            "    private val _uiState = MutableStateFlow(UiState())",
-            "    val uiState: StateFlow<UiState> = _uiState.asStateFlow()",
-            "",
-            "    data class UiState(",
-            "        val isLoading: Boolean = false,",
-            "        val errorMessage: String? = null",
-            "    )",
-            ""
-        ])
+        lines.append(_DEFAULT_UI_STATE)
 
     # 初期化ブロック
-    lines.extend([
-        "    init {",
-        "        // 初期化処理",
-        "        loadData()",
-        "    }",
-        ""
-    ])
+    lines.append(_INIT_BLOCK)
 
     # メソッド
     lines.append("    // メソッド")
 
-    # Swift のメソッドを Kotlin のメソッドに変換
+    # Swift のメソッドを Kotlin のメソッドに変換（loadData があるかどうかも同じ走査で確認）
+    has_load_data = False
     for method in viewmodel_info['methods']:
         method_name = method['name']
 
+        if method_name == 'loadData':
+            has_load_data = True
+
         # 特定のメソッド名は無視
         if method_name in ['init', 'deinit']:
             continue
 
         lines.append(f"    fun {method_name}() {{")
-        lines.append("        viewModelScope.launch {")
-        lines.append("            try {")
-        lines.append("                // TODO: 実装")
-        lines.append("            } catch (e: Exception) {")
-        lines.append("                // エラー処理")
-        lines.append("            }")
-        lines.append("        }")
-        lines.append("    }")
-        lines.append("")
+        lines.append(_METHOD_BODY)
 
     # デフォルトのデータ読み込みメソッド
-    if not any(method['name'] == 'loadData' for method in viewmodel_info['methods']):
-        lines.extend([
-            "    private fun loadData() {",
-            "        viewModelScope.launch {",
-            "            try {",
-            "                // TODO: データの読み込み処理",
-            "            } catch (e: Exception) {",
-            "                // エラー処理",
-            "            }",
-            "        }",
-            "    }"
-        ])
+    if not has_load_data:
+        lines.append(_LOAD_DATA_METHOD)
 
     lines.append("}")
 
@@ -32,6 +32,7 @@ import sys
 import shutil
 import re
 import json
+import logging
 import argparse
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
@@ -49,8 +50,8 @@ from converters.network_converter import setup_network
 from converters.resource_converter import convert_resources
 from converters.manifest_converter import generate_manifest
 from converters.gradle_converter import setup_gradle
-from utils.file_utils import copy_directory, ensure_directory, read_file, write_file
-from utils.parser import parse_swift_file, parse_kotlin_template
+from utils.file_utils import CACHE_DIR_NAME, copy_directory, ensure_directory, read_file, set_cache_dir, write_file
+from utils.parser import parse_swift_file, parse_kotlin_template, prune_parse_cache
 
 # 定数
 DEFAULT_FROM_DIR = "../from"
@@ -135,8 +136,12 @@ def analyze_swift_project(from_dir: str) -> Dict[str, Any]:
 
     # ディレクトリを再帰的に走査
     for root, dirs, files in os.walk(from_dir):
+        # 隠しディレクトリ（.git や .build など）は変換対象ではないため、その下を走査しない
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+
         for file in files:
-            if file.endswith('.swift'):
+            # 隠しファイル（._ で始まるリソースフォークなど）は除く
+            if file.endswith('.swift') and not file.startswith('.'):
                 file_path = os.path.join(root, file)
                 relative_path = os.path.relpath(file_path, from_dir)
 
@@ -175,6 +180,9 @@ def main():
     """メイン関数"""
     args = parse_arguments()
 
+    # 変換処理のログを標準出力へ出力するように設定
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+
     print("Swift から Kotlin への変換を開始します...")
     print(f"変換元: {args.from_dir}")
     print(f"出力先: {args.output_dir}")
@@ -184,6 +192,9 @@ def main():
     # プロジェクト構造をセットアップ
     package_dir = setup_project_structure(args)
 
+    # 解析結果や差分変換用のマニフェストは出力先ディレクトリの下にキャッシュする（--clean で一緒に削除される）
+    set_cache_dir(os.path.join(args.output_dir, CACHE_DIR_NAME))
+
     # Swift プロジェクトを解析
     project_info = analyze_swift_project(args.from_dir)
 
@@ -217,6 +228,9 @@ def main():
     # Gradle ファイルをセットアップ
     setup_gradle(args.output_dir, project_info, args.package_name, args.app_name)
 
+    # 解析結果のキャッシュが増え続けないよう、古いものを削除
+    prune_parse_cache()
+
     print("変換が完了しました！")
     print(f"生成されたプロジェクトは {args.output_dir} にあります。")
 
@@ -7,16 +7,34 @@
 
 from .file_utils import (
     ensure_directory,
+    get_cache_dir,
+    set_cache_dir,
     read_file,
+    read_file_mmap,
     write_file,
+    write_file_direct,
+    write_lines,
     copy_file,
     copy_directory,
     get_file_extension,
     get_filename,
     list_files,
 )
+from .manifest import (
+    load_manifest,
+    save_manifest,
+    file_hash,
+    dependency_hash,
+    is_up_to_date,
+    update_manifest,
+)
+from .incremental import convert_changed_files
+from .parallel import keep_last_per_output, map_parallel, project_flags
 from .parser import (
     parse_swift_file,
+    parse_swift_file_cached,
+    parse_swift_content_cached,
+    prune_parse_cache,
     parse_kotlin_template,
     swift_type_to_kotlin,
     swift_method_to_kotlin,
@@ -24,14 +42,32 @@ from .parser import (
 
 __all__ = [
     'ensure_directory',
+    'get_cache_dir',
+    'set_cache_dir',
     'read_file',
+    'read_file_mmap',
     'write_file',
+    'write_file_direct',
+    'write_lines',
     'copy_file',
     'copy_directory',
     'get_file_extension',
     'get_filename',
     'list_files',
+    'load_manifest',
+    'save_manifest',
+    'file_hash',
+    'dependency_hash',
+    'is_up_to_date',
+    'update_manifest',
+    'convert_changed_files',
+    'keep_last_per_output',
+    'map_parallel',
+    'project_flags',
     'parse_swift_file',
+    'parse_swift_file_cached',
+    'parse_swift_content_cached',
+    'prune_parse_cache',
     'parse_kotlin_template',
     'swift_type_to_kotlin',
     'swift_method_to_kotlin',
@@ -5,19 +5,59 @@
 ファイル操作用のユーティリティ関数
 """
 
+import mmap
 import os
 import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional, Union
+
+# 変換ツールのキャッシュ（解析結果や差分変換用のマニフェスト）を保存するディレクトリの名前（出力先ディレクトリの直下に作成する）
+CACHE_DIR_NAME = '.stok_cache'
+
+# STOK_DIRECT_IO=1 の場合は生成ファイルをページキャッシュを経由せずに書き込む（Linux のみ）
+DIRECT_IO = os.environ.get('STOK_DIRECT_IO') == '1' and hasattr(os, 'O_DIRECT')
+
+# このプロセスで作成済みのディレクトリ（同じディレクトリへの makedirs の繰り返しを省略する）
+_ENSURED_DIRS = set()
+
+# キャッシュを保存するディレクトリ（set_cache_dir で設定するまではキャッシュを使用しない）
+_CACHE_DIR: Optional[str] = None
+
+def set_cache_dir(cache_dir: Optional[str]) -> None:
+    """
+    キャッシュを保存するディレクトリを設定します。
+
+    作業ディレクトリにキャッシュを残さないよう、変換の開始時に出力先ディレクトリの下を設定します。
+
+    Args:
+        cache_dir: キャッシュを保存するディレクトリのパス（None の場合はキャッシュを使用しない）
+    """
+    global _CACHE_DIR
+    _CACHE_DIR = cache_dir
+
+def get_cache_dir() -> Optional[str]:
+    """
+    キャッシュを保存するディレクトリを取得します。
+
+    Returns:
+        キャッシュを保存するディレクトリのパス（設定されていない場合は None）
+    """
+    return _CACHE_DIR
 
 def ensure_directory(directory: str) -> None:
     """
     ディレクトリが存在しない場合は作成します。
 
+    一度作成したディレクトリは記録しておき、以降の呼び出しではシステムコールを発行しません。
+
     Args:
         directory: 作成するディレクトリのパス
     """
+    if directory in _ENSURED_DIRS:
+        return
+
     os.makedirs(directory, exist_ok=True)
+    _ENSURED_DIRS.add(directory)
 
 def read_file(file_path: str) -> str:
     """
@@ -32,19 +72,113 @@ def read_file(file_path: str) -> str:
     with open(file_path, 'r', encoding='utf-8') as f:
         return f.read()
 
-def write_file(file_path: str, content: str) -> None:
+def read_file_mmap(file_path: str) -> Union[mmap.mmap, bytes]:
+    """
+    ファイルを読み取り専用でメモリマップします。
+
+    大きなファイルを Python の文字列にコピーせず、bytes パターンの正規表現で直接走査するために使用します。
+    空のファイルはマップできないため、その場合は空の bytes を返します。
+
+    Args:
+        file_path: 読み込むファイルのパス
+
+    Returns:
+        ファイルの内容のメモリマップ
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def write_file(file_path: str, content: Union[str, bytes]) -> None:
     """
     ファイルに内容を書き込みます。
 
+    内容は UTF-8 のバイト列にしてから一度の write システムコールで書き込みます。
+
+    Args:
+        file_path: 書き込むファイルのパス
+        content: 書き込む内容（文字列またはバイト列）
+    """
+    # ディレクトリが存在しない場合は作成
+    ensure_directory(os.path.dirname(file_path))
+
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
+    # open(..., 'w') と同じく 0o666 から umask を除いたパーミッションで作成する
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            # 通常は一度で書き込まれるが、部分書き込みの場合は残りを書き込む
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+def write_file_direct(file_path: str, content: Union[str, bytes]) -> None:
+    """
+    ファイルに内容を O_DIRECT で書き込みます。
+
+    大量のファイルを生成する場合にページキャッシュへの二重コピーを避けるためのものです。
+    O_DIRECT ではバッファと書き込みサイズをブロック境界に揃える必要があるため、
+    ページ境界に揃った匿名メモリマップに内容をコピーし、切り上げたサイズで書き込んでから
+    本来のサイズに切り詰めます。DIRECT_IO が無効な場合や、ファイルシステムが O_DIRECT に
+    対応していない場合は write_file で書き込みます。
+
+    Args:
+        file_path: 書き込むファイルのパス
+        content: 書き込む内容（文字列またはバイト列）
+    """
+    if not DIRECT_IO:
+        write_file(file_path, content)
+        return
+
+    # ディレクトリが存在しない場合は作成
+    ensure_directory(os.path.dirname(file_path))
+
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
+    try:
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666)
+    except OSError:
+        # tmpfs など O_DIRECT に対応していないファイルシステム
+        write_file(file_path, data)
+        return
+
+    try:
+        # 書き込みサイズをブロック境界に切り上げる（匿名メモリマップはページ境界に揃っている）
+        alignment = mmap.ALLOCATIONGRANULARITY
+        size = max(alignment, -(-len(data) // alignment) * alignment)
+        with mmap.mmap(-1, size) as buf:
+            buf.write(data)
+            offset = 0
+            while offset < size:
+                offset += os.pwrite(fd, memoryview(buf)[offset:], offset)
+        os.ftruncate(fd, len(data))
+    finally:
+        os.close(fd)
+
+def write_lines(file_path: str, lines: Iterable[str]) -> None:
+    """
+    行のイテラブルを改行で区切ってファイルに書き込みます。
+
+    出力全体を一つの文字列にまとめずに、生成された行を順にバッファ付きで書き込みます。
+    "\n".join(lines) を write_file で書き込んだ場合と同じ内容になります（末尾に改行は付けません）。
+
     Args:
         file_path: 書き込むファイルのパス
-        content: 書き込む内容
+        lines: 書き込む行
     """
     # ディレクトリが存在しない場合は作成
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    ensure_directory(os.path.dirname(file_path))
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
+        separator = ''
+        for line in lines:
+            f.write(separator)
+            f.write(line)
+            separator = '\n'
 
 def copy_file(src: str, dst: str) -> None:
     """
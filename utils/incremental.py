@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+前回の変換から変更されたファイルだけを並列に変換するためのユーティリティ関数
+
+変換の要否はマニフェストで判断し、変換が必要なファイルだけをワーカーに渡します。
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+
+from .manifest import load_manifest, save_manifest, file_hash, dependency_hash, is_up_to_date, update_manifest
+from .parallel import keep_last_per_output, map_parallel
+
+logger = logging.getLogger(__name__)
+
+def convert_changed_files(label: str, from_dir: str, source_paths: Iterable[str],
+                          plan: Callable[[str], Tuple[str, Any]], convert: Callable[[str, str, Any], None],
+                          project_info: Dict[str, Any], package_name: str) -> None:
+    """
+    変換元ファイルのうち、前回の変換から入力か出力が変わったものだけを並列に変換します。
+
+    見つからないファイルと、後のファイルと出力先が同じファイルは警告して除きます。
+    変換した結果はマニフェストに記録します。
+
+    Args:
+        label: ログに表示するファイルの種類（「サービス」など）
+        from_dir: 変換元の iOS プロジェクトディレクトリ
+        source_paths: 変換元ファイルの相対パス
+        plan: 相対パスから (出力先のパス, convert に渡す引数) を決める関数（呼び出し元のプロセスで実行）
+        convert: (変換元のパス, 出力先のパス, 引数) を受け取り、変換して書き込む関数
+            （ワーカープロセスに渡すため、モジュールのトップレベルで定義された関数にしてください）
+        project_info: プロジェクト情報（依存情報のハッシュに使用）
+        package_name: Android アプリのパッケージ名（依存情報のハッシュに使用）
+    """
+    # 差分変換用のマニフェスト
+    manifest = load_manifest()
+    dep_hash = dependency_hash(project_info, package_name)
+
+    # 出力先を先に決め、同じ出力先に並列に書き込まないよう最後のファイルだけを残す
+    planned = keep_last_per_output((source_path, *plan(source_path)) for source_path in source_paths)
+
+    # 変換が必要なファイルを遅延生成し、各ファイルは独立しているため並列に変換
+    jobs = _changed_file_jobs(label, from_dir, planned, convert, manifest, dep_hash)
+    for full_path, kotlin_path, input_hash in map_parallel(_convert_job, jobs):
+        update_manifest(manifest, full_path, kotlin_path, input_hash, dep_hash)
+        logger.info("%sを変換しました: %s", label, kotlin_path)
+
+    save_manifest(manifest)
+
+def _changed_file_jobs(label: str, from_dir: str, planned: Iterable[Tuple[str, str, Any]],
+                       convert: Callable[[str, str, Any], None], manifest: Dict[str, Any], dep_hash: str) -> Iterator[Tuple[Callable[[str, str, Any], None], str, str, str, Any]]:
+    """
+    変換が必要なファイルの変換タスクを順に生成します。
+
+    Args:
+        label: ログに表示するファイルの種類
+        from_dir: 変換元の iOS プロジェクトディレクトリ
+        planned: (変換元ファイルの相対パス, 出力先のパス, convert に渡す引数) のイテラブル
+        convert: 変換して書き込む関数
+        manifest: 差分変換用のマニフェスト
+        dep_hash: 依存情報のハッシュ
+
+    Returns:
+        (変換する関数, 変換元のパス, 出力先のパス, 入力のハッシュ, 引数) のイテレータ
+    """
+    for source_path, kotlin_path, args in planned:
+        full_path = os.path.join(from_dir, source_path)
+
+        # 事前に存在確認をせず、読み込みに失敗した場合に警告する
+        try:
+            input_hash = file_hash(full_path)
+        except FileNotFoundError:
+            logger.warning("警告: %sファイルが見つかりません: %s", label, full_path)
+            continue
+
+        # 前回の変換から入力が変わっておらず、出力も書き込んだときのままであればスキップ
+        if is_up_to_date(manifest, full_path, kotlin_path, input_hash, dep_hash):
+            logger.info("%sは変更されていません: %s", label, source_path)
+            continue
+
+        logger.info("%sを変換しています: %s", label, source_path)
+        yield convert, full_path, kotlin_path, input_hash, args
+
+def _convert_job(job: Tuple[Callable[[str, str, Any], None], str, str, str, Any]) -> Tuple[str, str, str]:
+    """
+    1 つのファイルを変換して書き込みます。ワーカープロセスで実行されます。
+
+    Args:
+        job: (変換する関数, 変換元のパス, 出力先のパス, 入力のハッシュ, 引数) のタプル
+
+    Returns:
+        (変換元のパス, 出力先のパス, 入力のハッシュ) のタプル
+    """
+    convert, full_path, kotlin_path, input_hash, args = job
+    convert(full_path, kotlin_path, args)
+    return full_path, kotlin_path, input_hash
\ No newline at end of file
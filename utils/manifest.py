@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+差分変換用のマニフェストを扱うユーティリティ関数
+
+出力ファイルごとに、変換元ファイルと入力のハッシュ、書き込んだ出力のハッシュを記録します。
+入力が前回の変換から変わっておらず出力ファイルも書き込んだときのままの場合は、変換を省略できます。
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+from .file_utils import get_cache_dir
+
+# マニフェストファイルの名前（キャッシュディレクトリの直下に保存する）
+MANIFEST_FILENAME = 'manifest.json'
+
+# 生成するコードを変更した場合はこの値を上げて、変更のないファイルも変換し直す
+_GENERATOR_VERSION = 1
+
+def _manifest_path() -> Optional[str]:
+    """
+    マニフェストファイルのパスを取得します。
+
+    Returns:
+        マニフェストファイルのパス（キャッシュディレクトリが設定されていない場合は None）
+    """
+    cache_dir = get_cache_dir()
+    return os.path.join(cache_dir, MANIFEST_FILENAME) if cache_dir is not None else None
+
+def load_manifest() -> Dict[str, Dict[str, str]]:
+    """
+    マニフェストを読み込みます。
+
+    Returns:
+        出力ファイルのパスをキーとするマニフェスト（存在しない場合やキャッシュを使用しない場合は空の辞書）
+    """
+    manifest_path = _manifest_path()
+    if manifest_path is None:
+        return {}
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return manifest if isinstance(manifest, dict) else {}
+
+def save_manifest(manifest: Dict[str, Dict[str, str]]) -> None:
+    """
+    マニフェストを書き込みます。書き込みに失敗しても変換は続行します。
+
+    キャッシュディレクトリが設定されていない場合は何もしません。
+
+    Args:
+        manifest: 保存するマニフェスト
+    """
+    manifest_path = _manifest_path()
+    if manifest_path is None:
+        return
+
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    except OSError:
+        pass
+
+def file_hash(file_path: str) -> str:
+    """
+    ファイルの内容の SHA-256 ハッシュを計算します。
+
+    Args:
+        file_path: ファイルのパス
+
+    Returns:
+        16 進数のハッシュ文字列
+    """
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def dependency_hash(project_info: Dict[str, Any], package_name: str) -> str:
+    """
+    生成結果に影響するプロジェクト全体の情報とジェネレータのバージョンのハッシュを計算します。
+
+    Args:
+        project_info: プロジェクト情報
+        package_name: Android アプリのパッケージ名
+
+    Returns:
+        16 進数のハッシュ文字列
+    """
+    payload = json.dumps({
+        'generator_version': _GENERATOR_VERSION,
+        'project_info': project_info,
+        'package_name': package_name,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def is_up_to_date(manifest: Dict[str, Dict[str, str]], source_path: str, output_path: str,
+                  input_hash: str, dep_hash: str) -> bool:
+    """
+    出力ファイルが最新かどうかを判断します。
+
+    Args:
+        manifest: マニフェスト
+        source_path: 変換元ファイルのパス
+        output_path: 出力ファイルのパス
+        input_hash: 変換元ファイルのハッシュ
+        dep_hash: プロジェクト情報のハッシュ
+
+    Returns:
+        前回の変換から入力が変わっておらず、出力ファイルが前回書き込んだ内容のままの場合は True
+    """
+    entry = manifest.get(output_path)
+    if not isinstance(entry, dict):
+        return False
+
+    if (entry.get('source'), entry.get('input_hash'), entry.get('dep_hash')) != (source_path, input_hash, dep_hash):
+        return False
+
+    # 出力先はテンプレートのコピーなどで上書きされることがあるため、存在するだけでなく内容も確認する
+    try:
+        return file_hash(output_path) == entry.get('output_hash')
+    except OSError:
+        return False
+
+def update_manifest(manifest: Dict[str, Dict[str, str]], source_path: str, output_path: str,
+                    input_hash: str, dep_hash: str) -> None:
+    """
+    変換した出力ファイルの情報をマニフェストに記録します。
+
+    出力ファイルは書き込み済みである必要があります。書き込んだ内容のハッシュも記録し、
+    次回の is_up_to_date で出力ファイルが書き換えられていないかを確認します。
+
+    Args:
+        manifest: マニフェスト
+        source_path: 変換元ファイルのパス
+        output_path: 出力ファイルのパス
+        input_hash: 変換元ファイルのハッシュ
+        dep_hash: プロジェクト情報のハッシュ
+    """
+    try:
+        output_hash = file_hash(output_path)
+    except OSError:
+        # 出力を確認できない場合は記録せず、次回は変換し直す
+        manifest.pop(output_path, None)
+        return
+
+    manifest[output_path] = {
+        'source': source_path,
+        'input_hash': input_hash,
+        'dep_hash': dep_hash,
+        'output_hash': output_hash,
+    }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ファイル単位の変換を並列に実行するためのユーティリティ関数
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+from .file_utils import get_cache_dir, set_cache_dir
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+logger = logging.getLogger(__name__)
+
+# これより少ないタスク数ではプロセス起動のコストの方が大きいため、スレッドで実行する
+PARALLEL_MIN_TASKS = 8
+
+# スレッドで実行する場合に同時に開くファイル数の上限
+MAX_IO_THREADS = 32
+
+# プロセスプールに一度に渡すタスク数（タスクを遅延生成する場合に保持するタスク数の上限）
+PARALLEL_BATCH_SIZE = 256
+
+def map_parallel(func: Callable[[T], R], tasks: Iterable[T], min_tasks: int = PARALLEL_MIN_TASKS) -> Iterator[R]:
+    """
+    タスクをプロセスプールで並列に実行し、結果をタスクの順に返します。
+
+    タスク数が少ない場合はスレッドプールで実行し、ファイルの読み書きだけを並行させます
+    （読み書きの間は GIL が解放されるため、プロセスを起動せずに I/O 待ちを重ねられます）。
+
+    tasks はジェネレータでもよく、PARALLEL_BATCH_SIZE 件ずつ取り出して実行するため、
+    すべてのタスクを一度にメモリに保持することはありません。
+
+    func と各タスクは別プロセスに渡すため、pickle 可能である必要があります
+    （func はモジュールのトップレベルで定義された関数にしてください）。
+
+    Args:
+        func: 各タスクに適用する関数
+        tasks: タスクのイテラブル
+        min_tasks: 並列実行を行う最小のタスク数
+
+    Returns:
+        結果のイテレータ
+    """
+    tasks = iter(tasks)
+
+    # タスク数が少ないかどうかを判断するため、先頭の min_tasks 件だけを取り出す
+    head = list(islice(tasks, min_tasks))
+
+    if len(head) <= 1:
+        for task in head:
+            yield func(task)
+        return
+
+    if len(head) < min_tasks:
+        with ThreadPoolExecutor(max_workers=min(len(head), MAX_IO_THREADS)) as executor:
+            yield from executor.map(func, head)
+        return
+
+    # プロセスプールは multiprocessing ごと読み込まれて重いため、使う場合にだけ読み込む
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = os.cpu_count() or 1
+
+    # ワーカープロセスが fork されない環境（spawn）でも同じキャッシュディレクトリを使うよう、起動時に設定する
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_cache_dir, initargs=(get_cache_dir(),)) as executor:
+        batch = head + list(islice(tasks, PARALLEL_BATCH_SIZE - len(head)))
+        while batch:
+            chunksize = max(1, len(batch) // (workers * 4))
+            yield from executor.map(func, batch, chunksize=chunksize)
+            batch = list(islice(tasks, PARALLEL_BATCH_SIZE))
+
+def keep_last_per_output(items: Iterable[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+    """
+    出力先が同じ項目のうち、最後のものだけを残します。
+
+    同じ出力ファイルを並列に書き込むと書き込みが競合し、短い内容が後から書き込まれた場合に
+    長い内容の末尾が残ることがあります。順に変換した場合と同じく最後の項目の結果が残るよう、
+    それより前の項目は警告して除きます。
+
+    Args:
+        items: (変換元のパス, 出力先のパス, ...) のタプルのイテラブル
+
+    Returns:
+        残した項目のリスト（元の順序を保つ）
+    """
+    items = list(items)
+
+    # 出力先ごとに最後の項目の位置を求める
+    last_index = {item[1]: i for i, item in enumerate(items)}
+
+    kept = []
+    for i, item in enumerate(items):
+        last = last_index[item[1]]
+        if i != last:
+            logger.warning("警告: %s は %s と出力先が同じため変換しません: %s", item[0], items[last][0], item[1])
+            continue
+        kept.append(item)
+
+    return kept
+
+def project_flags(project_info: Dict[str, Any]) -> Dict[str, bool]:
+    """
+    プロジェクト情報のうち、コードの生成で参照する uses_* のフラグだけを取り出します。
+
+    タスクはワーカープロセスにコピーして渡すため、ファイルの一覧を含むプロジェクト情報全体の代わりにこれを渡します。
+
+    Args:
+        project_info: プロジェクト情報
+
+    Returns:
+        uses_firebase などのフラグだけを含む辞書
+    """
+    return {key: value for key, value in project_info.items() if key.startswith('uses_')}
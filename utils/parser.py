@@ -5,9 +5,80 @@
 Swift と Kotlin のコードを解析するためのパーサーユーティリティ
 """
 
+import hashlib
+import json
+import os
 import re
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Optional, Any
 
+from .file_utils import get_cache_dir, read_file
+
+# 解析結果のディスクキャッシュを保存するディレクトリの名前（キャッシュディレクトリの直下に作成する）
+PARSE_CACHE_DIRNAME = 'parse'
+
+# ディスクキャッシュに残す解析結果の最大数（超えた分は最後に使用した日時が古いものから削除する）
+PARSE_CACHE_MAX_ENTRIES = 10000
+
+# パーサーの出力形式を変更した場合はこの値を上げてディスクキャッシュを無効化する
+_PARSE_CACHE_VERSION = 3
+
+# Swift ファイル解析用の正規表現（モジュール読み込み時に一度だけコンパイル）
+_SWIFT_IMPORT_RE = re.compile(r'import\s+(\w+)')
+_SWIFT_CLASS_RE = re.compile(r'(class|struct|enum|protocol|extension)\s+(\w+)(?:\s*:\s*([^{]+))?')
+_SWIFT_PROPERTY_RE = re.compile(r'(?:var|let)\s+(\w+)\s*:\s*([^\n{]+)')
+_SWIFT_METHOD_RE = re.compile(r'func\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*([^{]+))?')
+
+# Kotlin テンプレート解析用の正規表現
+_KOTLIN_PACKAGE_RE = re.compile(r'package\s+([^\n]+)')
+_KOTLIN_IMPORT_RE = re.compile(r'import\s+([^\n]+)')
+_KOTLIN_CLASS_RE = re.compile(r'(class|interface|object|sealed class|data class|enum class)\s+(\w+)(?:\s*:\s*([^{]+))?')
+_KOTLIN_PROPERTY_RE = re.compile(r'(?:val|var)\s+(\w+)\s*:\s*([^\n=]+)(?:\s*=\s*([^\n]+))?')
+_KOTLIN_METHOD_RE = re.compile(r'fun\s+(\w+)\s*\(([^)]*)\)\s*(?::\s*([^{]+))?')
+
+# Swift の型から Kotlin の型への基本的な対応（読み取り専用）
+_TYPE_MAPPINGS = {
+    'String': 'String',
+    'Int': 'Int',
+    'Double': 'Double',
+    'Float': 'Float',
+    'Bool': 'Boolean',
+    'Character': 'Char',
+    'Any': 'Any',
+    'AnyObject': 'Any',
+    'Void': 'Unit',
+    'Never': 'Nothing',
+    'Date': 'java.util.Date',
+    'URL': 'java.net.URL',
+    'Data': 'ByteArray',
+    'UUID': 'java.util.UUID',
+    'Dictionary<String, Any>': 'Map<String, Any>',
+    'Dictionary<String, String>': 'Map<String, String>',
+    'Array<String>': 'List<String>',
+    'Array<Int>': 'List<Int>',
+    '[String]': 'List<String>',
+    '[Int]': 'List<Int>',
+    '[String: Any]': 'Map<String, Any>',
+    '[String: String]': 'Map<String, String>',
+}
+SWIFT_TO_KOTLIN_TYPE_MAPPINGS = MappingProxyType(_TYPE_MAPPINGS)
+
+# 型変換で引く辞書の get（読み取り専用のビューを経由せず、元の辞書を直接引く）
+_kotlin_type_for = _TYPE_MAPPINGS.get
+
+# Swift の型変換用の正規表現
+# オプショナル型・配列型・辞書型・短縮形の配列型・短縮形の辞書型を一つの選択にまとめ、
+# 先頭から順に試して最初に一致した形（最後に閉じたグループ名）で変換方法を決める
+_TYPE_SHAPE_RE = re.compile(
+    r'(?P<optional>\w+)\?'
+    r'|Array<(?P<array>.+)>'
+    r'|Dictionary<(?P<dict_key>.+),\s*(?P<dict_value>.+)>'
+    r'|\[(?P<short_array>.+)\]'
+    r'|\[(?P<short_dict_key>.+):\s*(?P<short_dict_value>.+)\]'
+)
+
 def parse_swift_file(content: str) -> Dict[str, Any]:
     """
     Swift ファイルの内容を解析します。
@@ -40,16 +111,19 @@ def parse_swift_file(content: str) -> Dict[str, Any]:
         'uses_firebase': False,
     }
 
+    # 各正規表現はキーワードを含まないファイルでは一致しないため、
+    # 先に部分文字列の検索（正規表現より高速）で確認し、不要な走査を省略する
+
     # インポートを抽出
-    import_pattern = r'import\s+(\w+)'
-    result['imports'] = re.findall(import_pattern, content)
+    if 'import' in content:
+        result['imports'] = _SWIFT_IMPORT_RE.findall(content)
 
     # クラス/構造体/列挙型/プロトコル/拡張の定義を抽出
-    class_pattern = r'(class|struct|enum|protocol|extension)\s+(\w+)(?:\s*:\s*([^{]+))?'
-    class_matches = re.findall(class_pattern, content)
+    # 使うのは最初の定義だけなので、ファイル全体を走査せず最初の一致で止める
+    class_match = _SWIFT_CLASS_RE.search(content)
 
-    if class_matches:
-        type_name, name, inheritance = class_matches[0]
+    if class_match:
+        type_name, name, inheritance = class_match.groups('')
         result['class_name'] = name.strip()
 
         if type_name == 'class':
@@ -71,8 +145,7 @@ def parse_swift_file(content: str) -> Dict[str, Any]:
                 result['protocols'] = inheritance_parts[1:]
 
     # プロパティを抽出
-    property_pattern = r'(?:var|let)\s+(\w+)\s*:\s*([^\n{]+)'
-    property_matches = re.findall(property_pattern, content)
+    property_matches = _SWIFT_PROPERTY_RE.findall(content) if 'var' in content or 'let' in content else []
 
     for name, type_info in property_matches:
         result['properties'].append({
@@ -82,8 +155,7 @@ def parse_swift_file(content: str) -> Dict[str, Any]:
         })
 
     # メソッドを抽出
-    method_pattern = r'func\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*([^{]+))?'
-    method_matches = re.findall(method_pattern, content)
+    method_matches = _SWIFT_METHOD_RE.findall(content) if 'func' in content else []
 
     for name, params, return_type in method_matches:
         result['methods'].append({
@@ -92,6 +164,18 @@ def parse_swift_file(content: str) -> Dict[str, Any]:
             'return_type': return_type.strip() if return_type else None,
         })
 
+    # Kotlin に変換したメソッドのシグネチャを、項目ごとの配列として一度だけ作成しておく
+    # （生成時にメソッドごとの辞書の参照と変換を繰り返さないため）
+    kotlin_methods = [
+        swift_method_to_kotlin(method['name'], method['parameters'], method['return_type'])
+        for method in result['methods']
+    ]
+    result['methods_soa'] = {
+        'names': [name for name, _, _ in kotlin_methods],
+        'params': [params for _, params, _ in kotlin_methods],
+        'rets': [ret for _, _, ret in kotlin_methods],
+    }
+
     # 特定の種類のファイルかどうかを判断
     if result['class_name']:
         if result['class_name'].endswith('ViewModel'):
@@ -112,6 +196,134 @@ def parse_swift_file(content: str) -> Dict[str, Any]:
 
     return result
 
+def parse_swift_file_cached(file_path: str) -> Dict[str, Any]:
+    """
+    Swift ファイルを読み込んで解析します。結果はキャッシュされます。
+
+    同じファイルが複数の変換対象（リポジトリとサービスなど）に含まれる場合や、
+    変換を再実行した場合でも、更新日時とサイズが変わっていなければ再解析しません。
+    返される辞書は呼び出し元の間で共有されるため、変更しないでください。
+
+    Args:
+        file_path: Swift ファイルのパス
+
+    Returns:
+        解析結果を含む辞書
+    """
+    stat = os.stat(file_path)
+    return _parse_swift_file_cached(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=1024)
+def _parse_swift_file_cached(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    parse_swift_file_cached のメモリキャッシュです。
+
+    Args:
+        file_path: Swift ファイルの絶対パス
+        mtime_ns: ファイルの更新日時（ナノ秒）
+        size: ファイルサイズ
+
+    Returns:
+        解析結果を含む辞書
+    """
+    return parse_swift_content_cached(read_file(file_path))
+
+def parse_swift_content_cached(content: str) -> Dict[str, Any]:
+    """
+    Swift ファイルの内容を解析します。結果は内容のハッシュをキーにディスクへキャッシュされます
+    （キャッシュディレクトリが設定されていない場合は毎回解析します）。
+
+    内容が同じであれば、別のパスのファイルや再実行時の解析結果も再利用します。
+    返される辞書は呼び出し元の間で共有されるため、変更しないでください。
+
+    Args:
+        content: Swift ファイルの内容
+
+    Returns:
+        解析結果を含む辞書
+    """
+    cache_dir = _parse_cache_dir()
+    if cache_dir is None:
+        return parse_swift_file(content)
+
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=20).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{digest}.json")
+
+    # ディスクキャッシュが有効であればそれを使用
+    # 解析結果は辞書・リスト・文字列・真偽値・None だけなので JSON で保存する
+    # （キャッシュは出力先ディレクトリに置かれるため、pickle のように読み込み時にコードを実行しうる形式は使わない）
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached['version'] == _PARSE_CACHE_VERSION and isinstance(cached['info'], dict):
+            # 古いものから削除する prune_parse_cache のため、使用した日時を更新する
+            os.utime(cache_path)
+            return cached['info']
+    except Exception:
+        # 壊れたキャッシュや形式の異なるキャッシュは無視して解析し直す
+        pass
+
+    info = parse_swift_file(content)
+
+    # ディスクキャッシュを更新（失敗しても変換は続行する）
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 並列実行中に他のプロセスやスレッドが読み込んでも壊れないよう、一時ファイルから置き換える
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': _PARSE_CACHE_VERSION, 'info': info}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return info
+
+def _parse_cache_dir() -> Optional[str]:
+    """
+    解析結果のディスクキャッシュを保存するディレクトリを取得します。
+
+    Returns:
+        ディレクトリのパス（キャッシュディレクトリが設定されていない場合は None）
+    """
+    cache_dir = get_cache_dir()
+    return os.path.join(cache_dir, PARSE_CACHE_DIRNAME) if cache_dir is not None else None
+
+def prune_parse_cache(max_entries: int = PARSE_CACHE_MAX_ENTRIES) -> None:
+    """
+    解析結果のディスクキャッシュを最大数までに減らします。
+
+    ファイルの内容が変わるたびにキャッシュが増え続けないよう、変換の最後に呼び出します。
+    最後に使用した日時が古いものから削除し、書き込みの途中で残った一時ファイルも削除します。
+
+    Args:
+        max_entries: 残す解析結果の最大数
+    """
+    cache_dir = _parse_cache_dir()
+    if cache_dir is None:
+        return
+
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                try:
+                    if entry.name.endswith('.tmp'):
+                        os.remove(entry.path)
+                    elif entry.name.endswith('.json'):
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    pass
+    except OSError:
+        return
+
+    # 最近使用したものから max_entries 件を残す
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 def parse_kotlin_template(content: str) -> Dict[str, Any]:
     """
     Kotlin テンプレートファイルの内容を解析します。
@@ -143,22 +355,23 @@ def parse_kotlin_template(content: str) -> Dict[str, Any]:
         'uses_firebase': False,
     }
 
+    # Swift の解析と同様に、キーワードを含まないファイルでは各正規表現の走査を省略する
+
     # パッケージを抽出
-    package_pattern = r'package\s+([^\n]+)'
-    package_match = re.search(package_pattern, content)
+    package_match = _KOTLIN_PACKAGE_RE.search(content) if 'package' in content else None
     if package_match:
         result['package'] = package_match.group(1).strip()
 
     # インポートを抽出
-    import_pattern = r'import\s+([^\n]+)'
-    result['imports'] = re.findall(import_pattern, content)
+    if 'import' in content:
+        result['imports'] = _KOTLIN_IMPORT_RE.findall(content)
 
     # クラス定義を抽出
-    class_pattern = r'(class|interface|object|sealed class|data class|enum class)\s+(\w+)(?:\s*:\s*([^{]+))?'
-    class_matches = re.findall(class_pattern, content)
+    # 使うのは最初の定義だけなので、ファイル全体を走査せず最初の一致で止める
+    class_match = _KOTLIN_CLASS_RE.search(content)
 
-    if class_matches:
-        type_name, name, inheritance = class_matches[0]
+    if class_match:
+        type_name, name, inheritance = class_match.groups('')
         result['class_name'] = name.strip()
 
         if type_name == 'data class':
@@ -180,8 +393,7 @@ def parse_kotlin_template(content: str) -> Dict[str, Any]:
                 result['interfaces'] = inheritance_parts[1:]
 
     # プロパティを抽出
-    property_pattern = r'(?:val|var)\s+(\w+)\s*:\s*([^\n=]+)(?:\s*=\s*([^\n]+))?'
-    property_matches = re.findall(property_pattern, content)
+    property_matches = _KOTLIN_PROPERTY_RE.findall(content) if 'val' in content or 'var' in content else []
 
     for name, type_info, default_value in property_matches:
         result['properties'].append({
@@ -191,8 +403,7 @@ def parse_kotlin_template(content: str) -> Dict[str, Any]:
         })
 
     # メソッドを抽出
-    method_pattern = r'fun\s+(\w+)\s*\(([^)]*)\)\s*(?::\s*([^{]+))?'
-    method_matches = re.findall(method_pattern, content)
+    method_matches = _KOTLIN_METHOD_RE.findall(content) if 'fun' in content else []
 
     for name, params, return_type in method_matches:
         result['methods'].append({
@@ -217,88 +428,74 @@ def parse_kotlin_template(content: str) -> Dict[str, Any]:
 
     return result
 
+@lru_cache(maxsize=4096)
 def swift_type_to_kotlin(swift_type: str) -> str:
     """
     Swift の型を Kotlin の型に変換します。
 
+    同じ型名は繰り返し現れるため、変換結果をキャッシュして正規表現の照合を省略します。
+
     Args:
         swift_type: Swift の型
 
     Returns:
         Kotlin の型
     """
-    # 基本的な型の変換
-    type_mapping = {
-        'String': 'String',
-        'Int': 'Int',
-        'Double': 'Double',
-        'Float': 'Float',
-        'Bool': 'Boolean',
-        'Character': 'Char',
-        'Any': 'Any',
-        'AnyObject': 'Any',
-        'Void': 'Unit',
-        'Never': 'Nothing',
-        'Date': 'java.util.Date',
-        'URL': 'java.net.URL',
-        'Data': 'ByteArray',
-        'UUID': 'java.util.UUID',
-        'Dictionary<String, Any>': 'Map<String, Any>',
-        'Dictionary<String, String>': 'Map<String, String>',
-        'Array<String>': 'List<String>',
-        'Array<Int>': 'List<Int>',
-        '[String]': 'List<String>',
-        '[Int]': 'List<Int>',
-        '[String: Any]': 'Map<String, Any>',
-        '[String: String]': 'Map<String, String>',
-    }
 
-    # オプショナル型の処理
-    optional_pattern = r'(\w+)\?'
-    optional_match = re.match(optional_pattern, swift_type)
-    if optional_match:
-        base_type = optional_match.group(1)
-        kotlin_base_type = type_mapping.get(base_type, base_type)
-        return f"{kotlin_base_type}?"
-
-    # 配列型の処理
-    array_pattern = r'Array<(.+)>'
-    array_match = re.match(array_pattern, swift_type)
-    if array_match:
-        element_type = array_match.group(1)
-        kotlin_element_type = swift_type_to_kotlin(element_type)
-        return f"List<{kotlin_element_type}>"
-
-    # 辞書型の処理
-    dict_pattern = r'Dictionary<(.+),\s*(.+)>'
-    dict_match = re.match(dict_pattern, swift_type)
-    if dict_match:
-        key_type = dict_match.group(1)
-        value_type = dict_match.group(2)
-        kotlin_key_type = swift_type_to_kotlin(key_type)
-        kotlin_value_type = swift_type_to_kotlin(value_type)
-        return f"Map<{kotlin_key_type}, {kotlin_value_type}>"
-
-    # 短縮形の配列型の処理
-    short_array_pattern = r'\[(.+)\]'
-    short_array_match = re.match(short_array_pattern, swift_type)
-    if short_array_match:
-        element_type = short_array_match.group(1)
-        kotlin_element_type = swift_type_to_kotlin(element_type)
-        return f"List<{kotlin_element_type}>"
-
-    # 短縮形の辞書型の処理
-    short_dict_pattern = r'\[(.+):\s*(.+)\]'
-    short_dict_match = re.match(short_dict_pattern, swift_type)
-    if short_dict_match:
-        key_type = short_dict_match.group(1)
-        value_type = short_dict_match.group(2)
-        kotlin_key_type = swift_type_to_kotlin(key_type)
-        kotlin_value_type = swift_type_to_kotlin(value_type)
+    match = _TYPE_SHAPE_RE.match(swift_type)
+    if match:
+        shape = match.lastgroup
+
+        # オプショナル型の処理
+        if shape == 'optional':
+            base_type = match.group('optional')
+            kotlin_base_type = _kotlin_type_for(base_type, base_type)
+            return f"{kotlin_base_type}?"
+
+        # 配列型・短縮形の配列型の処理
+        if shape in ('array', 'short_array'):
+            kotlin_element_type = swift_type_to_kotlin(match.group(shape))
+            return f"List<{kotlin_element_type}>"
+
+        # 辞書型・短縮形の辞書型の処理
+        prefix = shape[:-len('value')]
+        kotlin_key_type = swift_type_to_kotlin(match.group(prefix + 'key'))
+        kotlin_value_type = swift_type_to_kotlin(match.group(prefix + 'value'))
         return f"Map<{kotlin_key_type}, {kotlin_value_type}>"
 
     # 基本的な型の変換
-    return type_mapping.get(swift_type, swift_type)
+    return _kotlin_type_for(swift_type, swift_type)
+
+@lru_cache(maxsize=4096)
+def _kotlin_parameters(parameters: str) -> str:
+    """
+    Swift のパラメータリストを Kotlin のパラメータリストに変換します。
+
+    各パラメータは一度だけ ':' で分割し、name: Type と label name: Type を同じ処理で扱います。
+    同じパラメータリスト（id: String など）はメソッド間やファイル間で繰り返し現れるため、結果をキャッシュします。
+
+    Args:
+        parameters: Swift のパラメータリスト
+
+    Returns:
+        Kotlin のパラメータリスト
+    """
+    # パラメータごとに呼び出すため、グローバル名の参照をローカル変数に束縛しておく
+    to_kotlin = swift_type_to_kotlin
+
+    param_parts = []
+    for param in parameters.split(','):
+        parts = param.split(':')
+        if len(parts) == 1:
+            # 単純なパラメータの場合
+            param_parts.append(param.strip())
+        elif len(parts) <= 3:
+            # Swift のパラメータ形式: name: Type または label name: Type（ラベルは使わない）
+            param_name = parts[-2].strip()
+            kotlin_param_type = to_kotlin(parts[-1].strip())
+            param_parts.append(f"{param_name}: {kotlin_param_type}")
+
+    return ", ".join(param_parts)
 
 def swift_method_to_kotlin(method_name: str, parameters: str, return_type: Optional[str]) -> Tuple[str, str, Optional[str]]:
     """
@@ -316,32 +513,7 @@ def swift_method_to_kotlin(method_name: str, parameters: str, return_type: Optio
     kotlin_method_name = method_name
 
     # パラメータの変換
-    kotlin_parameters = ""
-    if parameters:
-        param_parts = []
-        for param in parameters.split(','):
-            param = param.strip()
-            if ':' in param:
-                # Swift のパラメータ形式: name: Type または label name: Type
-                parts = param.split(':')
-                if len(parts) == 2:
-                    param_name, param_type = parts
-                    param_name = param_name.strip()
-                    param_type = param_type.strip()
-                    kotlin_param_type = swift_type_to_kotlin(param_type)
-                    param_parts.append(f"{param_name}: {kotlin_param_type}")
-                elif len(parts) == 3:
-                    # ラベル付きパラメータの場合
-                    _, param_name, param_type = parts
-                    param_name = param_name.strip()
-                    param_type = param_type.strip()
-                    kotlin_param_type = swift_type_to_kotlin(param_type)
-                    param_parts.append(f"{param_name}: {kotlin_param_type}")
-            else:
-                # 単純なパラメータの場合
-                param_parts.append(param)
-
-        kotlin_parameters = ", ".join(param_parts)
+    kotlin_parameters = _kotlin_parameters(parameters) if parameters else ""
 
     # 戻り値の型の変換
     kotlin_return_type = None